@@ -1,190 +1,197 @@
 import streamlit as st
-import re
+import os
 import time
-import io
-import google.generativeai as genai
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from fpdf import FPDF
+import hashlib
+from datetime import datetime
+from notulen.archive import KIND_NOTULEN, KIND_REPAIR, get_archive
+from notulen.backends import MOCK_API_KEY, mock_backend_enabled
+from notulen.cache import get_response_cache
+from notulen.compact import compaction_summary
+from notulen.engine import FALLBACK_MODELS
+from notulen.export import create_word_document, create_pdf_document
+from notulen.jobs import ACTIVE_STATUSES, QUEUED, get_job_queue
+from notulen.metrics import get_metrics, track
+from notulen.prompts import build_chat_prompt, build_repair_prompt, estimate_tokens
+from notulen.registry import get_model_registry
+from notulen.retrieval import TranscriptIndex
+from notulen.rolling import get_rolling_store, meeting_key
+from notulen.summarize import build_source_text
+from notulen.vtt import Cue, parse_vtt, cues_to_text
 
 # ==============================================================================
-# SECTION 1: DATA PROCESSING & EXPORT TOOLS
+# SECTION 1: CACHE & UI HELPERS (logika inti ada di paket notulen/)
 # ==============================================================================
 
-def process_vtt_text(vtt_text):
-    cleaned = re.sub(r"\d{2}:\d{2}:\d{2}\.\d{3} --> .*\n?", "", vtt_text)
-    cleaned = re.sub(r"WEBVTT.*\n?", "", cleaned)
-    return "\n".join([line.strip() for line in cleaned.splitlines() if line.strip()])
-
-def create_word_document(content):
-    doc = Document()
-    for section in doc.sections:
-        section.top_margin = section.bottom_margin = section.left_margin = section.right_margin = Inches(1)
-    
-    title = doc.add_heading('Notulen Rapat', level=0)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    doc.add_paragraph()
-
-    lines = content.split('\n')
-    in_table = False
-    table_data = []
-
-    for line in lines:
-        line_strip = line.strip()
-        if line_strip.startswith('|') and line_strip.endswith('|'):
-            if not in_table:
-                in_table = True
-                table_data = []
-            if re.match(r'^\|[-\s|]+\|$', line_strip):
-                continue
-            cells = [cell.strip() for cell in line_strip.strip('|').split('|')]
-            table_data.append(cells)
-        else:
-            if in_table:
-                table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
-                table.style = 'Table Grid'
-                for i, row in enumerate(table_data):
-                    for j in range(min(len(table_data[0]), len(row))):
-                        # Konversi <br> ke newline asli MS Word
-                        clean_text = row[j].replace('<br>', '\n').replace('<br/>', '\n')
-                        table.cell(i, j).text = clean_text
-                in_table = False
-                table_data = []
-                doc.add_paragraph()
-
-            if line_strip.startswith('# ') and line_strip != "# Notulen Rapat":
-                doc.add_heading(line_strip[2:], level=1)
-            elif line_strip.startswith('## '):
-                doc.add_heading(line_strip[3:], level=2)
-            elif line_strip.startswith('- ') or line_strip.startswith('* '):
-                doc.add_paragraph(line_strip[2:], style='List Bullet')
-            elif line_strip and line_strip != "# Notulen Rapat": 
-                p = doc.add_paragraph()
-                parts = re.split(r'(\*\*.*?\*\*)', line_strip)
-                for part in parts:
-                    if part.startswith('**') and part.endswith('**'):
-                        p.add_run(part[2:-2]).bold = True
-                    else:
-                        p.add_run(part)
-
-    if in_table:
-        table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
-        table.style = 'Table Grid'
-        for i, row in enumerate(table_data):
-            for j in range(min(len(table_data[0]), len(row))):
-                clean_text = row[j].replace('<br>', '\n').replace('<br/>', '\n')
-                table.cell(i, j).text = clean_text
-
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
-
-import markdown
-from fpdf import FPDF 
-
-class PDF(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 15)
-        self.cell(0, 10, 'Notulen Rapat', 0, 1, 'C')
-        self.ln(5)
-
-def create_pdf_document(content):
-    pdf = PDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=11)
-    
-    # --- NORMALISASI UNICODE SANGAT KETAT UNTUK FPDF ---
-    # Mengganti karakter khusus AI menjadi karakter Latin-1 standar
-    replacements = {
-        '“': '"', '”': '"', '‘': "'", '’': "'",
-        '–': '-', '—': '-', '•': '-', '…': '...',
-        '\u200b': '', '\xa0': ' '
-    }
-    for k, v in replacements.items():
-        content = content.replace(k, v)
-        
-    # Paksa buang sisa Unicode aneh yang tidak terdeteksi (diubah jadi '?')
-    content = content.encode('latin-1', 'replace').decode('latin-1')
-    
-    lines = content.split('\n')
-    for line in lines:
-        line_strip = line.strip()
-        # Bersihkan elemen HTML & Markdown statis
-        clean_line = line_strip.replace('<br>', '\n').replace('<br/>', '\n').replace('**', '')
-        
-        if clean_line.startswith('|') and clean_line.endswith('|'):
-            if re.match(r'^\|[-\s|]+\|$', clean_line):
-                continue
-            cells = [cell.strip() for cell in clean_line.strip('|').split('|')]
-            text = " | ".join(cells)
-            pdf.multi_cell(0, 8, txt=text)
-        elif clean_line.startswith('#') and clean_line != "# Notulen Rapat":
-            pdf.set_font("Arial", 'B', 12)
-            pdf.multi_cell(0, 10, txt=clean_line.replace('#', '').strip())
-            pdf.set_font("Arial", size=11)
-        elif clean_line and clean_line != "? Notulen Rapat" and clean_line != "# Notulen Rapat":
-            pdf.multi_cell(0, 8, txt=clean_line)
-            
-    return pdf.output(dest='S').encode('latin-1', 'replace')
+# --- CACHE EKSPOR: dibangun saat pertama diunduh, dipakai ulang lintas rerun & sesi ---
+EXPORT_CACHE_ENTRIES = 32
+
+@st.cache_resource
+def _export_build_times():
+    return {}
+
+def _content_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+@st.cache_data(max_entries=EXPORT_CACHE_ENTRIES, show_spinner=False)
+def build_export(kind, content):
+    start = time.perf_counter()
+    if kind == "docx":
+        data = create_word_document(content).getvalue()
+    else:
+        data = create_pdf_document(content)
+    build_times = _export_build_times()
+    build_times[(kind, _content_hash(content))] = time.perf_counter() - start
+    while len(build_times) > EXPORT_CACHE_ENTRIES * 2:
+        build_times.pop(next(iter(build_times)))
+    return data
+
+def export_build_caption(content):
+    build_times = _export_build_times()
+    content_hash = _content_hash(content)
+    parts = [f"{kind.upper()} {build_times[(kind, content_hash)]:.2f} dtk" for kind in ("docx", "pdf") if (kind, content_hash) in build_times]
+    return "Waktu build: " + ", ".join(parts) if parts else ""
+
+# --- INDEKS RETRIEVAL TANYA JAWAB: dibangun sekali per transkrip (di-cache per hash) ---
+CHAT_FULL_CONTEXT_TOKENS = 6000
+CHAT_TOP_K = 6
+CHAT_HISTORY_TURNS = 4
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_transcript_index(transcript_hash, _cues):
+    return TranscriptIndex.from_cues(_cues)
+
+def restore_transcript(transcript, cues=None):
+    # Konteks tanya jawab dari transkrip tersimpan (arsip / job sesi lain); tanpa cue,
+    # tanya jawab akan mengirim seluruh transkrip di setiap pertanyaan
+    if cues is None:
+        cues = list(parse_vtt(transcript, collapse=False))
+    st.session_state.transcript_text = transcript
+    st.session_state.transcript_hash = _content_hash(transcript)
+    st.session_state.transcript_cues = cues
+    get_transcript_index(st.session_state.transcript_hash, cues)
+
+def response_caption(res):
+    # Model penjawab + metrik streaming (time-to-first-token & token/detik)
+    parts = []
+    if res.get('model'):
+        parts.append(res['model'] + (" (cache)" if res.get('cached') else ""))
+    if res.get('ttft') is not None:
+        parts.append(f"TTFT {res['ttft']:.1f} dtk")
+    if res.get('tokens_per_sec'):
+        parts.append(f"{res['tokens_per_sec']:.0f} token/dtk")
+    return "Dijawab oleh: " + " • ".join(parts) if parts else ""
+
+def rolling_caption(res):
+    if not res.get('incremental'):
+        return ""
+    return f"Notulen bergulir: {res['new_cues']} cue baru dirangkum, {res['known_cues']} cue sudah tercakup"
+
+# --- ANTREAN JOB: LLM dijalankan worker latar belakang, UI hanya mem-poll status ---
+JOB_POLL_SECONDS = 1.0
+URL_JOB_KINDS = ("generate", "repair")  # id job disimpan di URL agar hasil bertahan saat refresh
+
+def start_job(kind, payload, **extra):
+    job_id = get_job_queue(api_key).submit(kind, payload)
+    st.session_state[f"{kind}_job"] = {"id": job_id, **extra}
+    if kind in URL_JOB_KINDS:
+        st.query_params[kind] = job_id
+
+def finish_job(kind, job, pending):
+    st.session_state[f"{kind}_job"] = None
+    res = job["result"] or {"success": False, "error": "Job berakhir tanpa hasil."}
+    if not res['success']:
+        st.session_state.job_errors[kind] = res['error']
+        return
+    if kind == "generate":
+        st.session_state.ai_notulen = res['content']
+        st.session_state.ai_notulen_info = " | ".join(filter(None, [response_caption(res), rolling_caption(res)]))
+        if not st.session_state.transcript_text:
+            # Sesi baru (mis. setelah refresh): pulihkan konteks tanya jawab dari payload job
+            rolling_payload = job["payload"].get("rolling")
+            cues = [Cue(*row) for row in rolling_payload["cues"]] if rolling_payload else None
+            restore_transcript(job["payload"]["transcript"], cues)
+    elif kind == "repair":
+        st.session_state.ai_repaired = res['content']
+        st.session_state.ai_repaired_info = response_caption(res)
+    else:
+        st.session_state.chat_history.append({"role": "assistant", "content": res['content'], "caption": response_caption(res), "passages": pending.get("passages")})
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_progress(kind, running_text):
+    pending = st.session_state.get(f"{kind}_job")
+    if not pending:
+        return
+    job = get_job_queue(api_key).get(pending["id"])
+    if job is None:
+        st.session_state[f"{kind}_job"] = None
+        return
+    if job["status"] in ACTIVE_STATUSES:
+        st.caption("⏳ Menunggu giliran worker..." if job["status"] == QUEUED else running_text)
+        if job["partial"]:
+            with st.container(border=True):
+                st.markdown(job["partial"], unsafe_allow_html=True)
+        return
+    finish_job(kind, job, pending)
+    st.rerun()
+
+def show_job_error(kind):
+    if error := st.session_state.job_errors.pop(kind, None):
+        st.error(error)
+
+# --- ARSIP RAPAT: pencarian full-text & ekspor ulang tanpa memanggil LLM ---
+ARCHIVE_KINDS = {"Semua": None, "Notulen": KIND_NOTULEN, "Reparasi": KIND_REPAIR}
+
+def archive_label(entry):
+    title = entry['nama_rapat'] or "(tanpa nama rapat)"
+    details = [entry['hari_tanggal'], entry['pemimpin_rapat'], datetime.fromtimestamp(entry['updated']).strftime("disimpan %d-%m-%Y %H:%M")]
+    prefix = "🛠️ " if entry['kind'] == KIND_REPAIR else "📝 "
+    return prefix + title + " — " + " • ".join(filter(None, details))
+
+def open_archived(meeting):
+    # Muat entri arsip ke sesi: notulen ke tab hasil/reparasi, transkrip sebagai konteks tanya jawab
+    if meeting['kind'] == KIND_REPAIR:
+        st.session_state.ai_repaired = meeting['notulen']
+        st.session_state.ai_repaired_info = "Dibuka dari arsip"
+        return
+    st.session_state.ai_notulen = meeting['notulen']
+    st.session_state.ai_notulen_info = "Dibuka dari arsip" + (f" • {meeting['model']}" if meeting['model'] else "")
+    restore_transcript(meeting['transcript'])
+    st.session_state.chat_history = []
+
+# --- PANEL ADMIN METRIK (opsional): aktifkan dengan NOTULEN_ADMIN=1 ---
+ADMIN_PANEL = os.environ.get("NOTULEN_ADMIN") == "1"
+
+def render_admin_panel():
+    metrics = get_metrics()
+    with st.sidebar:
+        st.markdown("### 📊 Panel Admin")
+        st.caption("Kesehatan model fallback (proses ini)")
+        st.dataframe(
+            [{"model": h["model"], "n": h["calls"], "latensi": None if h["mean_latency"] is None else round(h["mean_latency"], 2),
+              "error": f"{h['error_rate']:.0%}", "nonaktif (dtk)": round(h["available_in"]) if h["available_in"] else None, "alasan": h["reason"]}
+             for h in get_model_registry(FALLBACK_MODELS).snapshot()],
+            hide_index=True, use_container_width=True
+        )
+        summary = metrics.percentiles()
+        if not summary:
+            st.caption("Belum ada metrik tercatat di proses ini.")
+            return
+        st.caption("Durasi tahap terbaru (detik)")
+        st.dataframe(
+            [{"tahap": stage, "n": s["count"], "p50": round(s["p50"], 3), "p90": round(s["p90"], 3), "p99": round(s["p99"], 3)} for stage, s in sorted(summary.items())],
+            hide_index=True, use_container_width=True
+        )
+        st.caption("Event terakhir")
+        st.dataframe(
+            [{k: e.get(k) for k in ("stage", "status", "duration", "model", "attempts", "cached", "tokens_in", "tokens_out")} for e in metrics.recent(15)],
+            hide_index=True, use_container_width=True
+        )
+        if metrics.enabled:
+            st.caption(f"Log JSON: `{metrics.log_path}` • Prometheus: `{metrics.prom_path}`")
 
 
 # ==============================================================================
-# SECTION 2: AI CORE ENGINE (SMART FALLBACK)
-# ==============================================================================
-
-def generate_with_fallback(prompt_text, api_key):
-    genai.configure(api_key=api_key)
-    
-    FALLBACK_MODELS = [
-       "models/gemini-3.5-flash",       
-        "models/gemini-3.1-flash-lite",  
-        "models/gemini-2.5-flash",       
-        "models/gemini-2.5-pro",         
-        "models/gemini-2.5-flash-lite"
-    ]
-    
-    generation_config = {"temperature": 0.1, "top_p": 0.95, "top_k": 40, "max_output_tokens": 8192}
-    safety_settings = [
-        {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-        {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-        {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-        {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"}
-    ]
-    
-    last_error = None
-    for i, model_name in enumerate(FALLBACK_MODELS):
-        try:
-            model = genai.GenerativeModel(model_name)
-            response = model.generate_content(
-                prompt_text, 
-                generation_config=generation_config, 
-                safety_settings=safety_settings
-            )
-            
-            if response.candidates and response.candidates[0].finish_reason.name == 'MAX_TOKENS':
-                raise Exception("MAX_TOKENS_REACHED")
-                
-            if response.text:
-                return {"success": True, "content": response.text}
-                
-        except Exception as e:
-            last_error = str(e)
-            err_str = last_error.lower()
-            
-            if i < len(FALLBACK_MODELS) - 1:
-                if '429' in err_str or 'quota' in err_str or 'exhausted' in err_str:
-                    time.sleep(2.5) 
-                elif '404' in err_str or 'not found' in err_str:
-                    pass 
-                elif 'max_tokens' in err_str:
-                    pass 
-    
-    return {"success": False, "error": f"Semua model gagal merespon. Error: {last_error}"}
-
-# ==============================================================================
-# SECTION 3: STREAMLIT UI (MNEV INTELLIGENCE)
+# SECTION 2: STREAMLIT UI (MNEV INTELLIGENCE)
 # ==============================================================================
 
 st.set_page_config(page_title="MNEV Intelligence | Notulen Generator", page_icon="📝", layout="wide")
@@ -225,12 +232,25 @@ st.markdown("""
 if "transcript_text" not in st.session_state: st.session_state.transcript_text = ""
 if "ai_notulen" not in st.session_state: st.session_state.ai_notulen = ""
 if "ai_repaired" not in st.session_state: st.session_state.ai_repaired = ""
+if "ai_notulen_info" not in st.session_state: st.session_state.ai_notulen_info = ""
+if "ai_repaired_info" not in st.session_state: st.session_state.ai_repaired_info = ""
 if "chat_history" not in st.session_state: st.session_state.chat_history = []
+if "transcript_cues" not in st.session_state: st.session_state.transcript_cues = []
+if "transcript_hash" not in st.session_state: st.session_state.transcript_hash = ""
+if "compaction_info" not in st.session_state: st.session_state.compaction_info = ""
+if "meeting_key" not in st.session_state: st.session_state.meeting_key = ""
+if "job_errors" not in st.session_state: st.session_state.job_errors = {}
+for job_kind in ("generate", "repair", "chat"):
+    if f"{job_kind}_job" not in st.session_state:
+        st.session_state[f"{job_kind}_job"] = {"id": st.query_params[job_kind]} if job_kind in st.query_params else None
 
 try:
     api_key = st.secrets["api_key"]
 except:
     api_key = None
+if not api_key and mock_backend_enabled():
+    # NOTULEN_BACKEND=mock tidak memanggil API Gemini sama sekali
+    api_key = MOCK_API_KEY
 
 col_left, col_right = st.columns([4, 8], gap="large")
 
@@ -247,6 +267,18 @@ with col_left:
     st.markdown("<center><span style='font-size:0.7rem; color:#a8a29e; font-weight:bold; letter-spacing:0.1em;'>DAN / ATAU</span></center>", unsafe_allow_html=True)
     
     manual_input = st.text_area("Tempel transkrip manual:", height=150, placeholder="Teks yang diketik di sini akan otomatis digabungkan dengan file unggahan (jika ada).")
+
+    use_cache = st.checkbox("Gunakan cache respons AI", value=True, help="Prompt yang sama (generate ulang, reparasi, atau pertanyaan chat berulang) diambil dari cache tanpa memanggil API.")
+    rolling = st.checkbox("Mode rapat berjalan (notulen bergulir)", value=False, help="Untuk ekspor VTT parsial dari rapat yang sama: hanya cue baru yang dikirim bersama notulen terkini, lalu digabung ke tabel. Status tersimpan sehingga refresh tidak mengulang dari awal.")
+    compact = st.checkbox("Ringkas transkrip sebelum dikirim ke AI", value=True, help="Menghapus kata pengisi (eh, ehm, jadi, ya...), baris duplikat, dan menggabungkan ucapan berurutan dari pembicara yang sama. Atribusi pembicara tetap dipertahankan.")
+    response_cache = get_response_cache()
+    if response_cache:
+        cache_col, clear_col = st.columns([5, 2], vertical_alignment="center")
+        if clear_col.button("Kosongkan", key="btn_cache_clear", help="Hapus semua respons AI tersimpan; permintaan berikutnya memanggil API lagi."):
+            response_cache.clear()
+            st.toast("Cache respons AI dikosongkan.")
+        cache_stats = response_cache.stats()
+        cache_col.caption(f"Cache: {cache_stats['hits']} hit / {cache_stats['misses']} miss • {cache_stats['entries']} entri tersimpan")
     
     if st.button("Generate Notulen Otomatis"):
         if not uploaded_file and not manual_input.strip():
@@ -254,85 +286,61 @@ with col_left:
         elif not api_key:
             st.error("Masukkan API Key terlebih dahulu.")
         else:
-            combined_transcript = ""
+            vtt_cues = []
             if uploaded_file:
-                raw_text = uploaded_file.getvalue().decode("utf-8")
-                combined_transcript += "SUMBER 1 (TRANSKRIP OTOMATIS):\n" + process_vtt_text(raw_text) + "\n\n"
-            if manual_input.strip():
-                combined_transcript += "SUMBER 2 (CATATAN MANUAL):\n" + manual_input.strip() + "\n\n"
+                with track("process_vtt_text", chars_in=uploaded_file.size) as parse_event:
+                    vtt_cues = list(parse_vtt(uploaded_file))
+                    parse_event["chars_out"] = len(cues_to_text(vtt_cues))
+            manual_text = manual_input.strip()
+            manual_cues = list(parse_vtt(manual_text, collapse=False)) if manual_text else []
+            transcript_cues = vtt_cues + manual_cues
+            combined_transcript, compaction = build_source_text(vtt_cues, manual_text, compact)
+            st.session_state.compaction_info = compaction_summary(compaction) if compaction else ""
                 
             st.session_state.transcript_text = combined_transcript
+            st.session_state.transcript_cues = transcript_cues
+            st.session_state.transcript_hash = _content_hash(combined_transcript)
+            get_transcript_index(st.session_state.transcript_hash, transcript_cues)
             
-            prompt = f"""**INI ADALAH DATA RAPAT FORMAL PERUSAHAAN PELINDO. BUATKAN NOTULEN RAPAT DENGAN BAHASA INDONESIA YANG SANGAT FORMAL, BAKU, DAN PROFESIONAL. HANYA FOKUS PADA AGENDA, DISKUSI, DAN KEPUTUSAN SAJA.**
-
-Anda akan menerima data transkrip/catatan rapat yang merupakan GABUNGAN dari beberapa sumber (contoh: gabungan file transkrip otomatis VTT Zoom dan catatan teks manual). Analisis dan sintesis seluruh teks gabungan tersebut sebagai satu kesatuan alur rapat yang utuh.
-
-Buatkan notulen rapat yang rapi dan komprehensif dari data rapat berikut:
-
-{combined_transcript}
-
-FORMAT YANG DIHARAPKAN (Gunakan format Tabel Markdown persis seperti ini):
-
-# Notulen Rapat
-
-| Judul | Keterangan |
-|---|---|
-| Nama Rapat | [Ekstrak/Isi nama rapat] |
-| Hari/Tanggal | [Ekstrak hari, tanggal] |
-| Waktu | [Ekstrak waktu rapat] |
-| Tempat | [Ekstrak lokasi/metode rapat] |
-| Pemimpin Rapat | [Ekstrak jabatan pemimpin rapat] |
-| Dibuat oleh | Group Monitoring Evaluasi Strategi Perusahaan dan Inovasi |
-
-**Agenda:**
-- [Daftar agenda rapat secara lengkap]
-
-**Peserta Rapat:**
-| No | Nama/Jabatan |
-|---|---|
-| 1 | [Nama peserta 1 / Jabatan] |
-
-**Poin Diskusi dan Arahan:**
-| Pembahasan / Topik | Penanggung Jawab |
-|---|---|
-| **[Topik Pembahasan 1 di sini]** | |
-| **Poin Diskusi:** | |
-| [Jabatan/Nama] menyampaikan:<br>• [Poin penyampaian 1 yang deskriptif, menjaga konteks teknis/strategis, dan menggunakan bahasa korporat formal]<br>• [Poin penyampaian 2 yang utuh dan tidak menghilangkan makna asli] | |
-| [Jabatan/Nama lain] menyampaikan/menyoroti:<br>• [Poin elaborasi yang komprehensif] | |
-| **Kesimpulan :** | |
-| [Jabatan/Nama] memberikan arahan sebagai berikut:<br>• [Poin kesimpulan yang jelas, tegas, dan dapat ditindaklanjuti] | [Jabatan Penanggung Jawab] |
-
-**Disclaimer:**
-_Jika tidak ada tanggapan dalam tiga hari sejak dokumen ini didistribusikan, maka dokumen ini dianggap final._
-
-INSTRUKSI KHUSUS DAN KETAT:
-1. Identifikasi Pembicara: Wajib mengekstrak siapa yang berbicara. Gunakan Jabatan (jika disebutkan/diketahui) atau nama peserta.
-2. Kedalaman Makna (SANGAT PENTING): JANGAN meringkas poin diskusi terlalu ekstrem. Pertahankan substansi, detail teknis, metrik/angka, dan konteks strategis dari pembicaraan asli. Setiap bullet point (•) harus berupa kalimat atau frasa yang utuh.
-3. Gaya Bahasa Profesional: Ubah bahasa lisan, slang, atau catatan kasar menjadi bahasa dokumen korporat tingkat tinggi. Gunakan kata kerja aktif/pasif yang formal (misal: "menyoroti pentingnya...", "mengusulkan skema...", "menjabarkan kendala...", "menginstruksikan agar...").
-4. Struktur Diskusi & Kesimpulan: Patuhi hierarki tabel: Topik -> "Poin Diskusi:" -> Siapa menyampaikan apa -> "Kesimpulan :" -> Arahan dan Penanggung Jawab di kolom kanan.
-5. Penggabungan Konteks: Gabungkan konteks dari berbagai sumber agar kronologi nyambung secara logis tanpa duplikasi informasi."""
-
-            with st.spinner("🤖 Menganalisis dan menyatukan data..."):
-                res = generate_with_fallback(prompt, api_key)
-                if res['success']:
-                    st.session_state.ai_notulen = res['content']
-                else:
-                    st.error(res['error'])
+            payload = {"transcript": combined_transcript, "use_cache": use_cache}
+            if rolling and vtt_cues:
+                st.session_state.meeting_key = meeting_key(vtt_cues)
+                payload["rolling"] = {
+                    "meeting_key": st.session_state.meeting_key,
+                    "cues": [[c.start, c.end, c.speaker, c.text] for c in transcript_cues],
+                    "manual": list(range(len(vtt_cues), len(transcript_cues))),
+                    "compact": compact,
+                }
+            start_job("generate", payload)
+    if st.session_state.generate_job:
+        job_progress("generate", "🤖 Menganalisis dan menyatukan data...")
+    show_job_error("generate")
+    if rolling and st.session_state.meeting_key:
+        if st.button("Mulai ulang notulen rapat ini", key="btn_rolling_reset", help="Hapus status notulen bergulir; unggahan berikutnya dirangkum dari awal."):
+            get_rolling_store().reset(st.session_state.meeting_key)
+            st.session_state.meeting_key = ""
+            st.toast("Status notulen bergulir dihapus.")
+    if st.session_state.compaction_info:
+        st.caption(st.session_state.compaction_info)
     st.markdown('</div>', unsafe_allow_html=True)
 
 
 with col_right:
-    tab1, tab2, tab3 = st.tabs(["📝 Hasil AI Notulen", "💬 Tanya Jawab", "🛠️ Repair Notulen (Standarisasi)"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📝 Hasil AI Notulen", "💬 Tanya Jawab", "🛠️ Repair Notulen (Standarisasi)", "🗄️ Arsip Rapat"])
     
     with tab1:
         if st.session_state.ai_notulen:
             c1, c2, c3 = st.columns([2, 2, 6])
+            notulen_md = st.session_state.ai_notulen
             with c1:
-                word_buffer = create_word_document(st.session_state.ai_notulen)
-                st.download_button("📄 Unduh Word (.docx)", word_buffer.getvalue(), "Notulen_Rapat.docx", use_container_width=True)
+                st.download_button("📄 Unduh Word (.docx)", lambda content=notulen_md: build_export("docx", content), "Notulen_Rapat.docx", use_container_width=True)
             with c2:
-                pdf_bytes = create_pdf_document(st.session_state.ai_notulen)
-                st.download_button("📕 Unduh PDF", pdf_bytes, "Notulen_Rapat.pdf", mime="application/pdf", use_container_width=True)
+                st.download_button("📕 Unduh PDF", lambda content=notulen_md: build_export("pdf", content), "Notulen_Rapat.pdf", mime="application/pdf", use_container_width=True)
+            with c3:
+                if st.session_state.ai_notulen_info:
+                    st.caption(st.session_state.ai_notulen_info)
+                if build_caption := export_build_caption(notulen_md):
+                    st.caption(build_caption)
             
             st.divider()
             with st.container(border=True):
@@ -348,21 +356,32 @@ with col_right:
             for msg in st.session_state.chat_history:
                 with st.chat_message(msg["role"]):
                     st.markdown(msg["content"], unsafe_allow_html=True)
+                    if msg.get("caption"):
+                        st.caption(msg["caption"])
+                    if msg.get("passages"):
+                        with st.expander("Rujukan transkrip"):
+                            for label, text in msg["passages"]:
+                                st.markdown(f"**[{label}]**")
+                                st.text(text)
             
-            if u_input := st.chat_input("Tanyakan spesifik terkait transkrip..."):
+            if u_input := st.chat_input("Tanyakan spesifik terkait transkrip...", disabled=bool(st.session_state.chat_job)):
                 st.session_state.chat_history.append({"role": "user", "content": u_input})
                 with st.chat_message("user"):
                     st.markdown(u_input, unsafe_allow_html=True)
                 
+                transcript = st.session_state.transcript_text
+                passages = None
+                if estimate_tokens(transcript) > CHAT_FULL_CONTEXT_TOKENS and st.session_state.transcript_cues:
+                    index = get_transcript_index(st.session_state.transcript_hash, st.session_state.transcript_cues)
+                    passages = index.search(u_input, k=CHAT_TOP_K) or None
+                history = st.session_state.chat_history[:-1][-CHAT_HISTORY_TURNS:]
+                context = build_chat_prompt(u_input, transcript=transcript, passages=passages, history=history)
+                start_job("chat", {"prompt": context, "use_cache": use_cache}, passages=[(p.label, p.text) for p in passages] if passages else None)
+            
+            if st.session_state.chat_job:
                 with st.chat_message("assistant"):
-                    with st.spinner("Mengetik..."):
-                        context = f"TRANSKRIP REFERENSI:\n{st.session_state.transcript_text}\n\nPERTANYAAN: {u_input}\n\nINSTRUKSI: Jawablah hanya berdasarkan transkrip di atas dengan bahasa Indonesia formal."
-                        chat_res = generate_with_fallback(context, api_key)
-                        if chat_res['success']:
-                            st.markdown(chat_res['content'], unsafe_allow_html=True)
-                            st.session_state.chat_history.append({"role": "assistant", "content": chat_res['content']})
-                        else:
-                            st.error(chat_res['error'])
+                    job_progress("chat", "Menyusun jawaban...")
+            show_job_error("chat")
 
     with tab3:
         st.markdown("### Standarisasi Draf Kasar")
@@ -374,64 +393,74 @@ with col_right:
             elif not api_key:
                 st.error("API Key missing.")
             else:
-                prompt_repair = f"""Anda adalah asisten AI profesional untuk Pelindo. Tugas Anda adalah mereparasi draf rapat yang acak-acakan menjadi bahasa Indonesia yang sangat formal, baku, dan kaya akan konteks profesional.
-
-        DRAF KASAR:
-        \"\"\"
-        {raw_notes}
-        \"\"\"
-
-        FORMAT WAJIB YANG HARUS DIGUNAKAN (Gunakan Tabel Markdown):
-        # Notulen Rapat
-        | Judul | Keterangan |
-        |---|---|
-        | Nama Rapat | [Ekstrak/Buat nama rapat] |
-        | Hari/Tanggal | [Ekstrak tanggal] |
-        | Waktu | [Ekstrak waktu] |
-        | Tempat | [Ekstrak tempat] |
-        | Pemimpin Rapat | [Ekstrak pemimpin] |
-        | Dibuat oleh | Group Monitoring Evaluasi Strategi Perusahaan dan Inovasi |
-
-        **Agenda:**\n- [Daftar agenda]
-
-        **Peserta Rapat:**
-        | No | Nama/Jabatan |
-        |---|---|
-        | 1 | [Ekstrak nama] |
-
-        **Poin Diskusi dan Arahan:**
-        | Pembahasan / Topik | Penanggung Jawab |
-        |---|---|
-        | **[Topik Pembahasan]** | |
-        | **Poin Diskusi:** | |
-        | [Jabatan/Nama] menyampaikan:<br>• [Poin penyampaian yang telah dielevasi menjadi bahasa formal tanpa mengurangi makna asli] | |
-        | **Kesimpulan :** | |
-        | [Jabatan/Nama] memberikan arahan sebagai berikut:<br>• [Poin arahan yang tegas] | [Penanggung Jawab] |
-
-        **Disclaimer:**\n_Jika tidak ada tanggapan dalam tiga hari sejak dokumen ini didistribusikan, maka dokumen ini dianggap final._
-        
-        INSTRUKSI REPARASI:
-        1. Jangan menghilangkan substansi atau mengecilkan makna dari draf asli. Perbaiki tata bahasanya saja menjadi kalimat korporat yang elegan.
-        2. Jika ada kalimat yang terpotong di draf, buat agar terdengar masuk akal dan formal secara bisnis."""
-                
-                with st.spinner("🤖 Memproses reparasi notulen..."):
-                    res_rep = generate_with_fallback(prompt_repair, api_key)
-                    if res_rep['success']:
-                        st.session_state.ai_repaired = res_rep['content']
-                    else:
-                        st.error(res_rep['error'])
+                start_job("repair", {"prompt": build_repair_prompt(raw_notes), "source": raw_notes, "use_cache": use_cache})
+        if st.session_state.repair_job:
+            job_progress("repair", "🤖 Memproses reparasi notulen...")
+        show_job_error("repair")
         
         if st.session_state.ai_repaired:
             st.divider()
-            rc1, rc2, _ = st.columns([2, 2, 6])
+            rc1, rc2, rc3 = st.columns([2, 2, 6])
+            repaired = st.session_state.ai_repaired
             with rc1:
-                r_word_buffer = create_word_document(st.session_state.ai_repaired)
-                st.download_button("📄 Unduh Word", r_word_buffer.getvalue(), "Reparasi_Notulen.docx", key="dl_rep_word", use_container_width=True)
+                st.download_button("📄 Unduh Word", lambda content=repaired: build_export("docx", content), "Reparasi_Notulen.docx", key="dl_rep_word", use_container_width=True)
             with rc2:
-                r_pdf_bytes = create_pdf_document(st.session_state.ai_repaired)
-                st.download_button("📕 Unduh PDF", r_pdf_bytes, "Reparasi_Notulen.pdf", mime="application/pdf", key="dl_rep_pdf", use_container_width=True)
+                st.download_button("📕 Unduh PDF", lambda content=repaired: build_export("pdf", content), "Reparasi_Notulen.pdf", mime="application/pdf", key="dl_rep_pdf", use_container_width=True)
+            with rc3:
+                if st.session_state.ai_repaired_info:
+                    st.caption(st.session_state.ai_repaired_info)
+                if build_caption := export_build_caption(repaired):
+                    st.caption(build_caption)
             
             with st.container(border=True):
                 # Memastikan <br> dirender sebagai baris baru
                 st.markdown(st.session_state.ai_repaired, unsafe_allow_html=True)
-                
+
+    with tab4:
+        archive = get_archive()
+        if archive is None:
+            st.info("Arsip rapat tidak aktif (NOTULEN_ARCHIVE=0 atau SQLite tanpa dukungan FTS5).")
+        else:
+            ac1, ac2 = st.columns([4, 1])
+            with ac1:
+                archive_query = st.text_input("Cari di arsip rapat", placeholder="Nama rapat, tanggal, pemimpin rapat, penanggung jawab, atau isi pembahasan...")
+            with ac2:
+                archive_kind = st.selectbox("Jenis", list(ARCHIVE_KINDS))
+            results = archive.search(archive_query, kind=ARCHIVE_KINDS[archive_kind])
+            st.caption(f"{len(results)} hasil teratas dari {archive.count()} entri tersimpan" if archive_query.strip() else f"{len(results)} entri terbaru dari {archive.count()} entri tersimpan")
+
+            if results:
+                entries = {entry['id']: entry for entry in results}
+                selected_id = st.radio("Hasil pencarian", list(entries), format_func=lambda i: archive_label(entries[i]), label_visibility="collapsed")
+                selected = entries[selected_id]
+                if selected['snippet']:
+                    st.caption(selected['snippet'])
+                if selected['penanggung_jawab']:
+                    st.caption("Penanggung Jawab: " + selected['penanggung_jawab'])
+                meeting = archive.get(selected_id)
+                if meeting:
+                    archived = meeting['notulen']
+                    ar1, ar2, ar3, ar4 = st.columns([2, 2, 3, 1])
+                    with ar1:
+                        st.download_button("📄 Unduh Word", lambda content=archived: build_export("docx", content), f"Arsip_Notulen_{selected_id}.docx", key="dl_arc_word", use_container_width=True)
+                    with ar2:
+                        st.download_button("📕 Unduh PDF", lambda content=archived: build_export("pdf", content), f"Arsip_Notulen_{selected_id}.pdf", mime="application/pdf", key="dl_arc_pdf", use_container_width=True)
+                    with ar3:
+                        if st.button("Buka di sesi ini", key="btn_arc_open", help="Tampilkan di tab hasil dan gunakan transkripnya untuk Tanya Jawab, tanpa memanggil AI."):
+                            open_archived(meeting)
+                            st.rerun()
+                    with ar4:
+                        if st.button("🗑️", key="btn_arc_delete", help="Hapus entri ini dari arsip"):
+                            archive.delete(selected_id)
+                            st.rerun()
+
+                    with st.container(border=True):
+                        st.markdown(archived, unsafe_allow_html=True)
+            elif archive_query.strip():
+                st.info("Tidak ada rapat yang cocok dengan pencarian.")
+            else:
+                st.info("Arsip masih kosong. Notulen dan hasil reparasi akan tersimpan otomatis di sini.")
+
+
+if ADMIN_PANEL:
+    render_admin_panel()
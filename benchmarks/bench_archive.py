@@ -0,0 +1,126 @@
+"""Benchmark arsip rapat (SQLite FTS5): waktu simpan dan latensi pencarian pada ribuan rapat.
+
+Jalankan dari root repo:  python benchmarks/bench_archive.py [--meetings 5000] [--budget-ms 50]
+Keluar dengan kode 1 bila p95 salah satu jenis query melebihi budget.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("NOTULEN_METRICS", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notulen.archive import KIND_NOTULEN, KIND_REPAIR, MeetingArchive, archive_key  # noqa: E402
+from notulen.export import create_word_document  # noqa: E402
+
+PEOPLE = ["Budi Santoso", "Siti Rahma", "Andi Pratama", "Dewi Lestari", "Rudi Hartono", "Maya Sari",
+          "Agus Salim", "Rina Wijaya", "Hendra Gunawan", "Lina Marlina", "Direktur Operasi", "VP Strategi",
+          "GM Terminal", "Kepala Divisi Keuangan", "Manajer SDM", "VP Teknik"]
+TOPICS = ["throughput terminal", "anggaran investasi", "kesiapan alat dermaga", "digitalisasi layanan",
+          "rekrutmen pegawai", "keselamatan kerja", "tarif jasa kepelabuhanan", "pengadaan crane",
+          "integrasi sistem", "evaluasi kinerja", "perawatan kapal tunda", "arus peti kemas"]
+WORDS = ("kita perlu memastikan target tercapai pada kuartal ini dengan memperhatikan koordinasi lintas "
+         "divisi laporan realisasi progres kendala usulan tindak lanjut jadwal vendor kontrak risiko "
+         "mitigasi biaya efisiensi pelanggan produktivitas dokumen persetujuan").split()
+MONTHS = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli", "Agustus", "September",
+          "Oktober", "November", "Desember"]
+DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat"]
+# Kata langka: satu proyek hanya muncul di segelintir rapat
+RARE_WORDS = 2000
+
+
+def sentence(rng, length):
+    words = rng.choices(WORDS, k=length)
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), f"proyek{rng.randrange(RARE_WORDS)}")
+    return " ".join(words).capitalize() + "."
+
+
+def synthetic_meeting(rng, number, transcript_lines=120):
+    people = rng.sample(PEOPLE, rng.randint(3, 8))
+    topics = rng.sample(TOPICS, rng.randint(1, 3))
+    date = f"{rng.choice(DAYS)}, {rng.randint(1, 28)} {rng.choice(MONTHS)} {rng.randint(2021, 2025)}"
+    transcript = "SUMBER 1 (TRANSKRIP OTOMATIS):\n" + "\n".join(
+        f"{rng.choice(people)}: {sentence(rng, rng.randint(6, 18))}" for _ in range(transcript_lines))
+    lines = [
+        "# Notulen Rapat", "", "| Judul | Keterangan |", "|---|---|",
+        f"| Nama Rapat | Rapat {topics[0].title()} #{number} |", f"| Hari/Tanggal | {date} |",
+        "| Tempat | Zoom Meeting |", f"| Pemimpin Rapat | {people[0]} |", "",
+        "**Poin Diskusi dan Arahan:**", "| Pembahasan / Topik | Penanggung Jawab |", "|---|---|",
+    ]
+    for topic in topics:
+        lines.append(f"| **{topic.title()}** | |")
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f"| {rng.choice(people)} menyampaikan:<br>• {sentence(rng, 14)}<br>• {sentence(rng, 10)} "
+                         f"| {rng.choice(people)} |")
+    return "\n".join(lines), transcript
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=30, help="Pengulangan per query")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Batas p95 latensi per query")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = MeetingArchive(os.path.join(tmp, "archive.sqlite3"))
+        meetings = [synthetic_meeting(rng, i) for i in range(args.meetings)]
+        start = time.perf_counter()
+        for i, (notulen, transcript) in enumerate(meetings):
+            kind = KIND_REPAIR if i % 10 == 0 else KIND_NOTULEN
+            archive.save(archive_key(kind, transcript), kind, notulen, transcript, "models/mock")
+        elapsed = time.perf_counter() - start
+        archive.optimize()
+        size = os.path.getsize(archive.path)
+        print(f"{args.meetings:,} rapat disimpan dalam {elapsed:.1f} dtk "
+              f"({args.meetings / elapsed:,.0f} rapat/dtk), database {size / 1e6:.1f} MB\n")
+
+        queries = [
+            ("terbaru (tanpa kata kunci)", "", None),
+            ("kata umum", "koordinasi", None),
+            ("kata langka", "proyek1234", None),
+            ("nama orang", "Hendra Gunawan", None),
+            ("tanggal", "Maret 2024", None),
+            ("prefiks saat mengetik", "pengada", None),
+            ("frasa + filter reparasi", "alat dermaga", KIND_REPAIR),
+            ("tanpa hasil", "zzzqwerty", None),
+        ]
+        print(f"{'query':<28} {'hasil':>6} {'p50':>9} {'p95':>9} {'maks':>9}")
+        ok = True
+        for label, query, kind in queries:
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                results = archive.search(query, kind=kind)
+                timings.append((time.perf_counter() - start) * 1000)
+            p95 = percentile(timings, 0.95)
+            ok &= p95 <= args.budget_ms
+            print(f"{label:<28} {len(results):>6} {statistics.median(timings):>7.2f}ms {p95:>7.2f}ms {max(timings):>7.2f}ms")
+
+        # Ambil entri penuh lalu ekspor ulang tanpa LLM
+        hit = archive.search("koordinasi")[0]
+        start = time.perf_counter()
+        meeting = archive.get(hit["id"])
+        fetched = time.perf_counter() - start
+        start = time.perf_counter()
+        create_word_document(meeting["notulen"])
+        exported = time.perf_counter() - start
+        print(f"\nambil entri {fetched * 1000:.2f} ms, ekspor ulang DOCX {exported * 1000:.1f} ms")
+
+    print(f"{'OK' if ok else 'GAGAL'}: p95 {'dalam' if ok else 'melebihi'} budget {args.budget_ms:g} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Benchmark kompaksi transkrip: pengurangan karakter/token dan pemeriksaan atribusi pembicara.
+
+Jalankan dari root repo:  python benchmarks/bench_compact.py [jam ...]
+Korpus: benchmarks/corpus/*.vtt (transkrip gaya Zoom) + transkrip sintetis berfiller.
+Keluar dengan kode 1 bila ada kata yang berpindah pembicara, pembicara yang hilang, atau
+kalimat kasus khusus yang maknanya berubah setelah filler dibuang.
+"""
+import glob
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_vtt import write_synthetic_vtt  # noqa: E402
+from notulen.compact import compact_cues, normalize_words, strip_fillers  # noqa: E402
+from notulen.vtt import parse_vtt  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+FILLERS = ["eh", "ehm", "jadi", "ya", "hmm", "gitu", "nah"]
+# (ucapan, hasil yang diharapkan): huruf tunggal, singkatan kapital, "begitu/gitu" tanpa koma,
+# dan penanda awal tanpa koma adalah isi, bukan filler
+STRIP_CASES = [
+    ("Kapal sandar di Dermaga E minggu lalu.", "Kapal sandar di Dermaga E minggu lalu."),
+    ("Gedung A dan gedung E sudah siap.", "Gedung A dan gedung E sudah siap."),
+    ("Tidak begitu.", "Tidak begitu."),
+    ("Apakah sudah begitu?", "Apakah sudah begitu?"),
+    ("Eh, anggaran naik, ya.", "Anggaran naik."),
+    ("Ehm, targetnya tercapai, gitu.", "Targetnya tercapai."),
+    ("Pembayaran UM 30 persen sudah cair.", "Pembayaran UM 30 persen sudah cair."),
+    ("Sertifikat HM lahan dermaga.", "Sertifikat HM lahan dermaga."),
+    ("Gudang EM dan AH", "Gudang EM dan AH"),
+    ("Jadi tidak rapatnya?", "Jadi tidak rapatnya?"),
+    ("Ya atau tidak?", "Ya atau tidak?"),
+    ("Jadi, eh, jadwalnya mundur.", "Jadwalnya mundur."),
+    ("Ya... hmm, kita lanjut.", "Kita lanjut."),
+]
+
+
+def write_filler_vtt(path, hours, seed=7):
+    # Transkrip sintetis bench_vtt ditambah filler di awal, tengah, dan akhir ucapan
+    write_synthetic_vtt(path, hours, seed)
+    rng = random.Random(seed)
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    for i, line in enumerate(lines):
+        speaker, sep, text = line.partition(": ")
+        if not sep:
+            continue
+        words = text.split()
+        if rng.random() < 0.5:
+            words.insert(0, rng.choice(FILLERS).capitalize() + ",")
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(1, len(words)), rng.choice(FILLERS[:2]) + ",")
+        if rng.random() < 0.3:
+            words[-1] += ", " + rng.choice(("ya", "gitu"))
+        lines[i] = f"{speaker}: {' '.join(words)}."
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def speaker_words(cues, strip=False):
+    words = defaultdict(set)
+    for cue in cues:
+        text = strip_fillers(cue.text) if strip else cue.text
+        words[cue.speaker].update(normalize_words(text))
+    return words
+
+
+def check_attribution(original, compacted):
+    # Setiap kata keluaran harus berasal dari pembicara yang sama di transkrip asli,
+    # dan setiap kata bermakna (setelah filler dibuang) harus tetap ada pada pembicaranya
+    source = speaker_words(original)
+    meaningful = speaker_words(original, strip=True)
+    result = speaker_words(compacted)
+    moved = sum(len(words - source.get(speaker, set())) for speaker, words in result.items())
+    lost_speakers = [s for s, words in meaningful.items() if words and s not in result]
+    lost_words = sum(len(words - result.get(speaker, set())) for speaker, words in meaningful.items())
+    return moved, lost_speakers, lost_words
+
+
+def check_strip_cases():
+    failed = [(text, expected, strip_fillers(text)) for text, expected in STRIP_CASES if strip_fillers(text) != expected]
+    for text, expected, got in failed:
+        print(f"kasus khusus GAGAL: {text!r} → {got!r} (harusnya {expected!r})")
+    print(f"kasus khusus filler: {len(STRIP_CASES) - len(failed)}/{len(STRIP_CASES)} OK")
+    return not failed
+
+
+def run(name, path):
+    with open(path, "rb") as f:
+        original = list(parse_vtt(f))
+    start = time.perf_counter()
+    compacted, stats = compact_cues(original)
+    elapsed = time.perf_counter() - start
+    moved, lost_speakers, lost_words = check_attribution(original, compacted)
+    ok = not moved and not lost_speakers and not lost_words
+    print(f"{name:<34} {stats['cues_before']:>6} → {stats['cues_after']:<6} "
+          f"{stats['tokens_before']:>8,} → {stats['tokens_after']:<8,} {1 - stats['ratio']:>6.1%} "
+          f"{elapsed * 1000:>7.0f}ms  {'OK' if ok else 'GAGAL'}"
+          f"  (filler {stats['fillers_removed']}, duplikat {stats['duplicates_removed']}, gabung {stats['merged']})")
+    if not ok:
+        print(f"    kata pindah pembicara: {moved}, pembicara hilang: {lost_speakers}, kata hilang: {lost_words}")
+    return ok
+
+
+def main(hours):
+    print(f"{'transkrip':<34} {'cue':>15} {'token (perkiraan)':>19} {'hemat':>6} {'waktu':>9}  atribusi")
+    ok = True
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*.vtt"))):
+        ok &= run(os.path.basename(path), path)
+    with tempfile.TemporaryDirectory() as tmp:
+        for h in hours:
+            path = os.path.join(tmp, f"sintetis_{h}h.vtt")
+            write_filler_vtt(path, h)
+            ok &= run(f"sintetis {h} jam (berfiller)", path)
+    ok &= check_strip_cases()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main([float(a) for a in sys.argv[1:]] or [1, 8]))
@@ -0,0 +1,185 @@
+"""Benchmark ekspor Word/PDF: renderer lama (regex per baris) vs IR bersama.
+
+Jalankan dari root repo:  python benchmarks/bench_export.py [jumlah_baris ...]
+"""
+import io
+import os
+import re
+import sys
+import time
+
+from docx import Document
+from docx.shared import Inches
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from fpdf import FPDF
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notulen.document import parse_markdown  # noqa: E402
+from notulen.export import create_pdf_document, create_word_document  # noqa: E402
+
+
+# --- Renderer lama (disalin apa adanya dari app.py sebelum IR) ---
+
+def legacy_create_word_document(content):
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = section.bottom_margin = section.left_margin = section.right_margin = Inches(1)
+    
+    title = doc.add_heading('Notulen Rapat', level=0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    doc.add_paragraph()
+
+    lines = content.split('\n')
+    in_table = False
+    table_data = []
+
+    for line in lines:
+        line_strip = line.strip()
+        if line_strip.startswith('|') and line_strip.endswith('|'):
+            if not in_table:
+                in_table = True
+                table_data = []
+            if re.match(r'^\|[-\s|]+\|$', line_strip):
+                continue
+            cells = [cell.strip() for cell in line_strip.strip('|').split('|')]
+            table_data.append(cells)
+        else:
+            if in_table:
+                table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
+                table.style = 'Table Grid'
+                for i, row in enumerate(table_data):
+                    for j in range(min(len(table_data[0]), len(row))):
+                        # Konversi <br> ke newline asli MS Word
+                        clean_text = row[j].replace('<br>', '\n').replace('<br/>', '\n')
+                        table.cell(i, j).text = clean_text
+                in_table = False
+                table_data = []
+                doc.add_paragraph()
+
+            if line_strip.startswith('# ') and line_strip != "# Notulen Rapat":
+                doc.add_heading(line_strip[2:], level=1)
+            elif line_strip.startswith('## '):
+                doc.add_heading(line_strip[3:], level=2)
+            elif line_strip.startswith('- ') or line_strip.startswith('* '):
+                doc.add_paragraph(line_strip[2:], style='List Bullet')
+            elif line_strip and line_strip != "# Notulen Rapat": 
+                p = doc.add_paragraph()
+                parts = re.split(r'(\*\*.*?\*\*)', line_strip)
+                for part in parts:
+                    if part.startswith('**') and part.endswith('**'):
+                        p.add_run(part[2:-2]).bold = True
+                    else:
+                        p.add_run(part)
+
+    if in_table:
+        table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
+        table.style = 'Table Grid'
+        for i, row in enumerate(table_data):
+            for j in range(min(len(table_data[0]), len(row))):
+                clean_text = row[j].replace('<br>', '\n').replace('<br/>', '\n')
+                table.cell(i, j).text = clean_text
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+class LegacyPDF(FPDF):
+    def header(self):
+        self.set_font('Arial', 'B', 15)
+        self.cell(0, 10, 'Notulen Rapat', 0, 1, 'C')
+        self.ln(5)
+
+def legacy_create_pdf_document(content):
+    pdf = LegacyPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=11)
+    
+    # --- NORMALISASI UNICODE SANGAT KETAT UNTUK FPDF ---
+    # Mengganti karakter khusus AI menjadi karakter Latin-1 standar
+    replacements = {
+        '“': '"', '”': '"', '‘': "'", '’': "'",
+        '–': '-', '—': '-', '•': '-', '…': '...',
+        '\u200b': '', '\xa0': ' '
+    }
+    for k, v in replacements.items():
+        content = content.replace(k, v)
+        
+    # Paksa buang sisa Unicode aneh yang tidak terdeteksi (diubah jadi '?')
+    content = content.encode('latin-1', 'replace').decode('latin-1')
+    
+    lines = content.split('\n')
+    for line in lines:
+        line_strip = line.strip()
+        # Bersihkan elemen HTML & Markdown statis
+        clean_line = line_strip.replace('<br>', '\n').replace('<br/>', '\n').replace('**', '')
+        
+        if clean_line.startswith('|') and clean_line.endswith('|'):
+            if re.match(r'^\|[-\s|]+\|$', clean_line):
+                continue
+            cells = [cell.strip() for cell in clean_line.strip('|').split('|')]
+            text = " | ".join(cells)
+            pdf.multi_cell(0, 8, txt=text)
+        elif clean_line.startswith('#') and clean_line != "# Notulen Rapat":
+            pdf.set_font("Arial", 'B', 12)
+            pdf.multi_cell(0, 10, txt=clean_line.replace('#', '').strip())
+            pdf.set_font("Arial", size=11)
+        elif clean_line and clean_line != "? Notulen Rapat" and clean_line != "# Notulen Rapat":
+            pdf.multi_cell(0, 8, txt=clean_line)
+            
+    return pdf.output(dest='S').encode('latin-1', 'replace')
+
+
+def synthetic_notulen(rows):
+    lines = [
+        "# Notulen Rapat", "",
+        "| Judul | Keterangan |", "|---|---|",
+        "| Nama Rapat | Rapat Evaluasi Kinerja Terminal |",
+        "| Hari/Tanggal | Senin, 12 Oktober 2026 |",
+        "| Pemimpin Rapat | Direktur Operasi |", "",
+        "**Agenda:**", "- Evaluasi kinerja", "- Rencana investasi", "",
+        "**Peserta Rapat:**", "| No | Nama/Jabatan |", "|---|---|",
+    ]
+    lines += [f"| {i} | Peserta {i} / VP Divisi {i % 17} |" for i in range(1, rows + 1)]
+    lines += ["", "**Poin Diskusi dan Arahan:**", "| Pembahasan / Topik | Penanggung Jawab |", "|---|---|"]
+    for i in range(1, rows + 1):
+        if i % 10 == 1:
+            lines.append(f"| **Topik Pembahasan {i // 10 + 1}** | |")
+        lines.append(
+            f"| VP Divisi {i % 17} menyampaikan:<br>• Realisasi throughput mencapai {80 + i % 20}% dari target"
+            f"<br>• Perlu percepatan pengadaan alat dermaga tahap {i % 5 + 1} | Divisi {i % 7} |"
+        )
+    lines += ["", "**Disclaimer:**", "_Jika tidak ada tanggapan dalam tiga hari, dokumen ini dianggap final._"]
+    return "\n".join(lines)
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(row_counts):
+    print(f"{'baris/tabel':>11} | {'docx lama':>10} {'docx IR':>10} | {'pdf lama':>10} {'pdf IR':>10} | {'parse IR':>9} {'cache':>9}")
+    for rows in row_counts:
+        content = synthetic_notulen(rows)
+        parse_markdown.cache_clear()
+        parse_cold = timed(parse_markdown, content, repeat=1)
+        parse_warm = timed(parse_markdown, content)
+        docx_old = timed(legacy_create_word_document, content, repeat=1)
+        docx_new = timed(create_word_document, content, repeat=1)
+        pdf_old = timed(legacy_create_pdf_document, content, repeat=1)
+        pdf_new = timed(create_pdf_document, content, repeat=1)
+        print(
+            f"{rows:>11} | {docx_old:>9.2f}s {docx_new:>9.2f}s | {pdf_old:>9.2f}s {pdf_new:>9.2f}s | "
+            f"{parse_cold * 1000:>7.1f}ms {parse_warm * 1e6:>7.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [50, 200, 300])
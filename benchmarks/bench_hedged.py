@@ -0,0 +1,70 @@
+"""Benchmark hedged requests vs fallback sekuensial pada backend mock berlatensi acak.
+
+Jalankan dari root repo:  python benchmarks/bench_hedged.py [jumlah_request]
+Latensi disimulasikan dalam skala 1/100 (0.08 dtk mewakili 8 dtk).
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notulen.backends import FakeStreamingBackend  # noqa: E402
+from notulen.engine import FALLBACK_MODELS  # noqa: E402
+from notulen.hedged import generate_hedged  # noqa: E402
+from notulen.registry import ModelRegistry  # noqa: E402
+
+PRIMARY, SECONDARY = FALLBACK_MODELS[0], FALLBACK_MODELS[1]
+
+
+def make_backend(seed):
+    rng = random.Random(seed)
+
+    def primary_latency():
+        # 85% normal (~0.08), 15% ekor panjang (0.4-0.8)
+        return rng.uniform(0.4, 0.8) if rng.random() < 0.15 else rng.lognormvariate(-2.5, 0.25)
+
+    def secondary_latency():
+        return rng.lognormvariate(-2.3, 0.25)
+
+    reply = "| Nama Rapat | Rapat Evaluasi |\n" * 4
+    return FakeStreamingBackend(
+        {PRIMARY: reply, SECONDARY: reply},
+        chunk_size=64,
+        latency={PRIMARY: primary_latency, SECONDARY: secondary_latency},
+    )
+
+
+async def run_mode(n, max_extra, hedge_delay, seed=11):
+    backend = make_backend(seed)
+    registry = ModelRegistry(FALLBACK_MODELS)
+    latencies, attempts = [], 0
+    for i in range(n):
+        start = time.perf_counter()
+        res = await generate_hedged(f"prompt {i}", "kunci-mock", use_cache=False, hedge_delay=hedge_delay,
+                                    max_extra=max_extra, backend=backend, registry=registry)
+        assert res["success"], res
+        latencies.append(time.perf_counter() - start)
+        attempts += res["attempts"]
+    latencies.sort()
+    q = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))]  # noqa: E731
+    return statistics.median(latencies), q(0.95), q(0.99), attempts / n
+
+
+def main(n):
+    modes = [
+        ("sekuensial", 0, None),
+        ("hedge 0.15s", 1, 0.15),
+        ("hedge p95", 1, None),
+    ]
+    print(f"{n} request | {'mode':<12} {'p50':>7} {'p95':>7} {'p99':>7} {'req/jawaban':>12}")
+    for name, max_extra, delay in modes:
+        p50, p95, p99, per_answer = asyncio.run(run_mode(n, max_extra, delay))
+        print(f"{'':>10} | {name:<12} {p50 * 1000:>5.0f}ms {p95 * 1000:>5.0f}ms {p99 * 1000:>5.0f}ms {per_answer:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,75 @@
+"""Guard waktu import modul inti (cold start) memakai `python -X importtime`.
+
+Jalankan dari root repo:  python benchmarks/bench_import.py [--budget-ms 150] [--runs 5]
+Keluar dengan kode 1 bila melebihi budget atau bila library berat ikut ter-import saat start.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modul yang di-import app.py saat start (tanpa Streamlit itu sendiri)
+CORE_MODULES = [
+    "notulen.storage", "notulen.cache", "notulen.engine", "notulen.export", "notulen.prompts",
+    "notulen.retrieval", "notulen.summarize", "notulen.vtt", "notulen.batch", "notulen.metrics", "notulen.compact", "notulen.rolling", "notulen.jobs", "notulen.archive",
+]
+# Library berat yang hanya boleh di-import saat fiturnya pertama kali dipakai
+LAZY_MODULES = ["google.generativeai", "docx", "fpdf", "numpy", "markdown"]
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure_once():
+    code = "import " + ", ".join(CORE_MODULES)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative, total_us = {}, 0
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        name = m.group(4)
+        cumulative[name] = int(m.group(2))
+        # Hanya baris level teratas (tanpa indentasi) agar modul bertingkat tidak terhitung ganda
+        if len(m.group(3)) == 1 and name.split(".")[0] == "notulen":
+            total_us += int(m.group(2))
+    return total_us, cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    totals, cumulative = [], {}
+    for _ in range(args.runs):
+        total_us, cumulative = measure_once()
+        totals.append(total_us / 1000)
+
+    median_ms = statistics.median(totals)
+    print(f"import modul inti: median {median_ms:.1f} ms (min {min(totals):.1f}, max {max(totals):.1f}) dari {args.runs} run")
+    for name, us in sorted(((n, us) for n, us in cumulative.items() if n.startswith("notulen")), key=lambda kv: -kv[1]):
+        print(f"  {us / 1000:>8.1f} ms  {name}")
+
+    eager = [name for name in LAZY_MODULES if name in cumulative]
+    failed = False
+    if eager:
+        print(f"GAGAL: library berat ter-import saat start: {', '.join(eager)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"GAGAL: melebihi budget {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print(f"OK: dalam budget {args.budget_ms:.0f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Benchmark end-to-end tanpa API key: parsing VTT, penyusunan prompt, jalur fallback
+(backend mock dengan 404/429), dan ekspor DOCX/PDF pada rapat sintetis kecil, sedang, dan 8 jam.
+
+Jalankan dari root repo:
+    python benchmarks/bench_suite.py [--sizes kecil sedang 8jam] [--json hasil.json]
+    python benchmarks/bench_suite.py --baseline hasil.json [--tolerance 0.3]
+Dengan --baseline, keluar dengan kode 1 bila waktu atau peak memory suatu tahap
+memburuk melebihi toleransi dibanding hasil sebelumnya.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+
+os.environ.setdefault("NOTULEN_METRICS", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_compact import write_filler_vtt  # noqa: E402
+from notulen.backends import MockGeminiBackend, not_found_error, quota_error  # noqa: E402
+from notulen.engine import FALLBACK_MODELS, generate_with_fallback  # noqa: E402
+from notulen.export import create_pdf_document, create_word_document  # noqa: E402
+from notulen.prompts import build_notulen_prompt, build_segment_prompt, estimate_tokens  # noqa: E402
+from notulen.registry import ModelRegistry  # noqa: E402
+from notulen.summarize import SINGLE_PASS_MAX_TOKENS, build_source_text, split_segments, summarize_transcript  # noqa: E402
+from notulen.vtt import parse_vtt  # noqa: E402
+
+SIZES = {"kecil": 0.25, "sedang": 1.5, "8jam": 8.0}
+# Model pertama 404, model kedua kena kuota; sisanya menjawab dengan latensi mock
+MOCK_LATENCY = 0.02
+
+
+def measure(fn):
+    # Waktu diukur tanpa tracemalloc; peak memory dari run kedua dengan tracemalloc
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def mock_backend():
+    return MockGeminiBackend({
+        FALLBACK_MODELS[0]: not_found_error(FALLBACK_MODELS[0]),
+        FALLBACK_MODELS[1]: quota_error(60),
+    }, base_latency=MOCK_LATENCY)
+
+
+def build_prompts(transcript):
+    if estimate_tokens(transcript) <= SINGLE_PASS_MAX_TOKENS:
+        return [build_notulen_prompt(transcript)]
+    segments = split_segments(transcript)
+    return [build_segment_prompt(segment, i, len(segments)) for i, segment in enumerate(segments, 1)]
+
+
+def run_fallback(transcript, calls):
+    # Registry & backend baru per run agar 404/429 dialami ulang seperti proses yang baru start
+    backend = mock_backend()
+    generate = partial(generate_with_fallback, backend=backend, registry=ModelRegistry(FALLBACK_MODELS))
+    res = summarize_transcript(transcript, "kunci-mock", generate=generate, use_cache=False)
+    assert res["success"], res
+    calls.append(len(backend.calls))
+    return res
+
+
+def run_size(name, hours, tmp):
+    path = os.path.join(tmp, f"{name}.vtt")
+    write_filler_vtt(path, hours)
+    size = os.path.getsize(path)
+    rows = []
+
+    def parse():
+        with open(path, "rb") as f:
+            return list(parse_vtt(f))
+
+    cues, elapsed, peak = measure(parse)
+    rows.append(("parse_vtt", elapsed, peak, f"{size / 1e6 / elapsed:.1f} MB/dtk"))
+
+    def prompt():
+        transcript, _ = build_source_text(cues, compact=True)
+        return transcript, build_prompts(transcript)
+
+    (transcript, prompts), elapsed, peak = measure(prompt)
+    prompt_chars = sum(len(p) for p in prompts)
+    rows.append(("prompt", elapsed, peak, f"{len(cues) / elapsed:,.0f} cue/dtk, {len(prompts)} prompt"))
+
+    calls = []
+    res, elapsed, peak = measure(lambda: run_fallback(transcript, calls))
+    rows.append(("fallback", elapsed, peak,
+                 f"{estimate_tokens(transcript) / elapsed:,.0f} token/dtk, {calls[-1]} request, {res.get('segments', 1)} segmen"))
+
+    content = res["content"]
+    table_rows = content.count("\n|")
+    buffer, elapsed, peak = measure(lambda: create_word_document(content))
+    rows.append(("docx", elapsed, peak, f"{table_rows / elapsed:,.0f} baris/dtk, {buffer.getbuffer().nbytes / 1e3:.0f} KB"))
+    pdf, elapsed, peak = measure(lambda: create_pdf_document(content))
+    rows.append(("pdf", elapsed, peak, f"{table_rows / elapsed:,.0f} baris/dtk, {len(pdf) / 1e3:.0f} KB"))
+
+    print(f"\n{name} ({hours:g} jam, {len(cues):,} cue, {size / 1e6:.2f} MB, ~{prompt_chars // 4:,} token prompt)")
+    for stage, elapsed, peak, throughput in rows:
+        print(f"  {stage:<10} {elapsed * 1000:>9.1f} ms {peak / 1e6:>9.2f} MB  {throughput}")
+    return {f"{name}/{stage}": {"seconds": elapsed, "peak_bytes": peak} for stage, elapsed, peak, _ in rows}
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        for field, label in (("seconds", "waktu"), ("peak_bytes", "memori")):
+            # Abaikan tahap yang terlalu cepat/kecil untuk diukur stabil
+            floor = 0.01 if field == "seconds" else 256 * 1024
+            if previous[field] > floor and current[field] > previous[field] * (1 + tolerance):
+                regressions.append(f"{key} {label}: {previous[field]:.4g} → {current[field]:.4g}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--json", help="Simpan hasil ke berkas JSON (untuk baseline berikutnya)")
+    parser.add_argument("--baseline", help="Bandingkan dengan hasil JSON sebelumnya")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Batas pemburukan relatif (default 0.3 = 30%%)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.sizes:
+            results.update(run_size(name, SIZES[name], tmp))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESI: {line}")
+        if regressions:
+            return 1
+        print(f"OK: tidak ada regresi di atas {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
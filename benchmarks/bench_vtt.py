@@ -0,0 +1,102 @@
+"""Benchmark parser VTT: regex lama vs parser cue streaming.
+
+Jalankan dari root repo:  python benchmarks/bench_vtt.py [jam ...]
+"""
+import gc
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notulen.vtt import cues_to_text, parse_vtt  # noqa: E402
+
+SPEAKERS = ["Budi Santoso", "Siti Rahma", "Direktur Operasi", "Andi Pratama", "VP Strategi"]
+WORDS = (
+    "kita perlu memastikan target throughput terminal tercapai pada kuartal ini dengan "
+    "memperhatikan kesiapan alat dermaga anggaran investasi serta koordinasi lintas divisi"
+).split()
+
+
+def _ts(seconds):
+    ms = int(seconds * 1000)
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d}"
+
+
+def write_synthetic_vtt(path, hours, seed=7):
+    # Pola Zoom: cue bernomor ~4 detik, sebagian mengulang/melanjutkan teks cue sebelumnya
+    rng = random.Random(seed)
+    t, n = 0.0, 1
+    prev_words = None
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("WEBVTT\n\n")
+        speaker = rng.choice(SPEAKERS)
+        while t < hours * 3600:
+            dur = rng.uniform(2.5, 5.5)
+            roll = rng.random()
+            if prev_words and roll < 0.15:
+                words = prev_words
+            elif prev_words and roll < 0.35:
+                words = prev_words[-4:] + rng.sample(WORDS, 6)
+            else:
+                if rng.random() < 0.3:
+                    speaker = rng.choice(SPEAKERS)
+                words = rng.sample(WORDS, rng.randint(6, 14))
+            f.write(f"{n}\n{_ts(t)} --> {_ts(t + dur)}\n{speaker}: {' '.join(words)}\n\n")
+            prev_words = words
+            t += dur
+            n += 1
+    return n - 1
+
+
+def legacy_process_vtt_text(vtt_text):
+    cleaned = re.sub(r"\d{2}:\d{2}:\d{2}\.\d{3} --> .*\n?", "", vtt_text)
+    cleaned = re.sub(r"WEBVTT.*\n?", "", cleaned)
+    return "\n".join([line.strip() for line in cleaned.splitlines() if line.strip()])
+
+
+def run_legacy(path):
+    with open(path, "rb") as f:
+        return legacy_process_vtt_text(f.read().decode("utf-8"))
+
+
+def run_streaming(path):
+    with open(path, "rb") as f:
+        return cues_to_text(parse_vtt(f))
+
+
+def measure(fn, path):
+    gc.collect()
+    t0 = time.perf_counter()
+    out = fn(path)
+    elapsed = time.perf_counter() - t0
+    del out
+    gc.collect()
+    tracemalloc.start()
+    out = fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(out)
+
+
+def main(hours_list):
+    print(f"{'durasi':>7} {'cue':>7} {'ukuran':>9} | {'metode':<10} {'waktu':>8} {'peak mem':>10} {'output':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for hours in hours_list:
+            path = os.path.join(tmp, f"rapat_{hours}j.vtt")
+            n = write_synthetic_vtt(path, hours)
+            size = os.path.getsize(path)
+            for name, fn in (("regex", run_legacy), ("streaming", run_streaming)):
+                elapsed, peak, out_len = measure(fn, path)
+                print(
+                    f"{hours:>6}j {n:>7} {size / 1e6:>7.2f}MB | {name:<10} {elapsed * 1000:>6.0f}ms "
+                    f"{peak / 1e6:>8.2f}MB {out_len / 1e6:>8.2f}MB"
+                )
+
+
+if __name__ == "__main__":
+    main([float(h) for h in sys.argv[1:]] or [4, 6, 8])
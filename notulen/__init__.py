@@ -0,0 +1 @@
+"""Inti pemrosesan Notulen Generator (tanpa ketergantungan Streamlit)."""
@@ -0,0 +1,211 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+from notulen.document import Table, parse_markdown, runs_text
+from notulen.metrics import track
+from notulen.storage import DATA_DIR, ProcessSingleton, SQLiteStore
+
+# ==============================================================================
+# ARSIP RAPAT PERSISTEN (SQLITE FTS5)
+# ==============================================================================
+# Setiap notulen hasil Generate, draf hasil Reparasi, beserta transkripnya
+# disimpan di SQLite dengan indeks full-text FTS5. Metadata (Nama Rapat,
+# Hari/Tanggal, Pemimpin Rapat, Penanggung Jawab) diambil dari tabel notulen
+# tanpa LLM. Tabel FTS memakai external content sehingga teks hanya disimpan
+# sekali; trigger menjaga indeks tetap sinkron. Rapat yang sama (transkrip sama,
+# atau kunci rapat bergulir yang sama) menimpa entri lamanya.
+
+ARCHIVE_PATH = os.path.join(DATA_DIR, "archive.sqlite3")
+
+# Set NOTULEN_ARCHIVE=0 untuk tidak menyimpan arsip sama sekali
+ARCHIVE_ENABLED = os.environ.get("NOTULEN_ARCHIVE", "1") != "0"
+
+KIND_NOTULEN, KIND_REPAIR = "notulen", "repair"
+METADATA_FIELDS = {
+    "Nama Rapat": "nama_rapat",
+    "Hari/Tanggal": "hari_tanggal",
+    "Pemimpin Rapat": "pemimpin_rapat",
+}
+# Bobot bm25 per kolom FTS: metadata lebih menentukan daripada isi transkrip.
+# Kolom kind hanya untuk filter di dalam MATCH (bobot 0) agar LIMIT tetap di FTS5
+FTS_COLUMNS = ("kind", "nama_rapat", "hari_tanggal", "pemimpin_rapat", "penanggung_jawab", "notulen", "transcript")
+FTS_WEIGHTS = (0.0, 10.0, 5.0, 5.0, 3.0, 1.0, 0.5)
+SNIPPET_TOKENS = 16
+SEARCH_LIMIT = 20
+
+QUERY_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def archive_key(*parts):
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def _placeholder(text):
+    return not text or text.startswith("[")
+
+
+def extract_metadata(markdown):
+    # Baca tabel identitas rapat & kolom Penanggung Jawab dari IR markdown notulen
+    meta = {field: "" for field in METADATA_FIELDS.values()}
+    responsible = []
+    for block in parse_markdown(markdown):
+        if not isinstance(block, Table):
+            continue
+        cells = [[runs_text(cell).strip() for cell in row] for row in block.rows]
+        if cells[0][-1] == "Penanggung Jawab":
+            for row in cells[1:]:
+                # Satu sel bisa berisi beberapa penanggung jawab dipisah <br>
+                for name in row[-1].split("\n"):
+                    name = name.strip(" •-*")
+                    if not _placeholder(name) and name not in responsible:
+                        responsible.append(name)
+            continue
+        for row in cells:
+            field = METADATA_FIELDS.get(row[0].strip("* "))
+            if field and len(row) > 1 and not meta[field] and not _placeholder(row[1]):
+                meta[field] = row[1]
+    meta["penanggung_jawab"] = "; ".join(responsible)
+    return meta
+
+
+def build_match_query(text, kind=None):
+    # Setiap kata dikutip (tanda baca pengguna tidak dianggap sintaks FTS5);
+    # kata terakhir dicari sebagai prefiks agar hasil muncul saat masih mengetik
+    tokens = QUERY_TOKEN_RE.findall(text)
+    if not tokens:
+        return ""
+    match = f"{{{' '.join(FTS_COLUMNS[1:])}}} : (" + " ".join(f'"{token}"' for token in tokens) + "*)"
+    return f'kind : "{kind}" AND {match}' if kind else match
+
+
+class MeetingArchive(SQLiteStore):
+    def __init__(self, path=ARCHIVE_PATH):
+        super().__init__(path)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meetings ("
+                "id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, kind TEXT NOT NULL, "
+                "nama_rapat TEXT NOT NULL, hari_tanggal TEXT NOT NULL, pemimpin_rapat TEXT NOT NULL, "
+                "penanggung_jawab TEXT NOT NULL, model TEXT, created REAL NOT NULL, updated REAL NOT NULL, "
+                "notulen TEXT NOT NULL, transcript TEXT NOT NULL)"
+            )
+            # Teks panjang di kolom terakhir: membaca metadata tidak perlu menelusuri overflow page
+            conn.execute("CREATE INDEX IF NOT EXISTS meetings_updated ON meetings (updated)")
+            conn.execute("CREATE INDEX IF NOT EXISTS meetings_kind_updated ON meetings (kind, updated)")
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5({', '.join(FTS_COLUMNS)}, "
+                "content='meetings', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+            # Peringkat bawaan (kolom rank) memakai bobot kolom sehingga ORDER BY rank dioptimasi FTS5
+            conn.execute("INSERT INTO meetings_fts (meetings_fts, rank) VALUES ('rank', ?)",
+                         (f"bm25({', '.join(map(str, FTS_WEIGHTS))})",))
+            columns = ", ".join(FTS_COLUMNS)
+            new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+            old_values = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS meetings_ai AFTER INSERT ON meetings BEGIN "
+                f"INSERT INTO meetings_fts (rowid, {columns}) VALUES (new.id, {new_values}); END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS meetings_ad AFTER DELETE ON meetings BEGIN "
+                f"INSERT INTO meetings_fts (meetings_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS meetings_au AFTER UPDATE ON meetings BEGIN "
+                f"INSERT INTO meetings_fts (meetings_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO meetings_fts (rowid, {columns}) VALUES (new.id, {new_values}); END"
+            )
+
+    def save(self, key, kind, notulen, transcript="", model=None):
+        # Simpan atau timpa entri dengan kunci yang sama; mengembalikan id entri
+        meta = extract_metadata(notulen)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO meetings (key, kind, nama_rapat, hari_tanggal, pemimpin_rapat, penanggung_jawab, "
+                "notulen, transcript, model, created, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET kind = excluded.kind, nama_rapat = excluded.nama_rapat, "
+                "hari_tanggal = excluded.hari_tanggal, pemimpin_rapat = excluded.pemimpin_rapat, "
+                "penanggung_jawab = excluded.penanggung_jawab, notulen = excluded.notulen, "
+                "transcript = excluded.transcript, model = excluded.model, updated = excluded.updated",
+                (key, kind, meta["nama_rapat"], meta["hari_tanggal"], meta["pemimpin_rapat"],
+                 meta["penanggung_jawab"], notulen, transcript, model, now, now),
+            )
+            return conn.execute("SELECT id FROM meetings WHERE key = ?", (key,)).fetchone()[0]
+
+    def search(self, query="", kind=None, limit=SEARCH_LIMIT):
+        # Tanpa kata kunci: entri terbaru. Hasil hanya berisi metadata + cuplikan, bukan teks penuh
+        match = build_match_query(query, kind)
+        with track("archive_search", chars_in=len(query)) as event, self._connect() as conn:
+            if match:
+                # Peringkat & LIMIT di subquery FTS5: hanya entri teratas yang di-join dan dibuatkan cuplikan
+                rows = conn.execute(
+                    "SELECT m.id, m.kind, m.nama_rapat, m.hari_tanggal, m.pemimpin_rapat, m.penanggung_jawab, "
+                    "m.model, m.updated, f.snip FROM ("
+                    f"SELECT rowid, rank, snippet(meetings_fts, -1, '**', '**', ' … ', {SNIPPET_TOKENS}) AS snip "
+                    "FROM meetings_fts WHERE meetings_fts MATCH ? ORDER BY rank LIMIT ?"
+                    ") f JOIN meetings m ON m.id = f.rowid ORDER BY f.rank",
+                    (match, limit),
+                ).fetchall()
+            else:
+                kind_filter = "WHERE kind = ? " if kind else ""
+                rows = conn.execute(
+                    "SELECT id, kind, nama_rapat, hari_tanggal, pemimpin_rapat, penanggung_jawab, model, updated, '' "
+                    f"FROM meetings {kind_filter}ORDER BY updated DESC LIMIT ?",
+                    (*([kind] if kind else []), limit),
+                ).fetchall()
+            event["results"] = len(rows)
+        return [
+            {"id": row[0], "kind": row[1], "nama_rapat": row[2], "hari_tanggal": row[3], "pemimpin_rapat": row[4],
+             "penanggung_jawab": row[5], "model": row[6], "updated": row[7],
+             "snippet": " ".join(row[8].replace("<br>", " ").replace("|", " ").split())}
+            for row in rows
+        ]
+
+    def get(self, meeting_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, kind, nama_rapat, hari_tanggal, pemimpin_rapat, penanggung_jawab, notulen, transcript, "
+                "model, created, updated FROM meetings WHERE id = ?",
+                (meeting_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "kind", "nama_rapat", "hari_tanggal", "pemimpin_rapat", "penanggung_jawab",
+                "notulen", "transcript", "model", "created", "updated")
+        return dict(zip(keys, row))
+
+    def delete(self, meeting_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+
+    def optimize(self):
+        # Gabungkan segmen indeks FTS5 (berguna setelah impor massal)
+        with self._connect() as conn:
+            conn.execute("INSERT INTO meetings_fts (meetings_fts) VALUES ('optimize')")
+
+
+# Mis. SQLite tanpa FTS5 atau direktori data read-only: arsip dinonaktifkan
+_archive = ProcessSingleton(MeetingArchive, errors=(OSError, sqlite3.Error))
+
+
+def get_archive():
+    return _archive.get() if ARCHIVE_ENABLED else None
+
+
+def archive_result(key, kind, res, transcript=""):
+    # Dipanggil setelah LLM selesai; kegagalan menyimpan arsip tidak menggagalkan hasil
+    archive = get_archive()
+    if archive is None or not res.get("success"):
+        return None
+    try:
+        return archive.save(key, kind, res["content"], transcript, res.get("model"))
+    except sqlite3.Error:
+        return None
@@ -0,0 +1,215 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+
+# ==============================================================================
+# BACKEND LLM (GEMINI ATAU MOCK LOKAL)
+# ==============================================================================
+# Backend dipakai generate_with_fallback, stream_with_fallback, dan generate_hedged:
+# - stream(...) menghasilkan potongan (teks, finish_reason); finish_reason bernilai
+#   None sampai potongan terakhir (mis. "STOP", "MAX_TOKENS").
+# - generate(...) mengembalikan (teks, finish_reason) sekaligus.
+# Error dilempar sebagai exception dengan pesan bergaya API (404/429) agar
+# registry mengklasifikasikannya sama seperti respons Gemini asli.
+# Set NOTULEN_BACKEND=mock untuk menjalankan app/batch tanpa API key. Jawaban backend
+# selain Gemini disimpan di cache dengan namespace terpisah (cache_namespace), dan mode
+# mock memakai direktori data sendiri, sehingga output palsu tidak pernah muncul
+# sebagai jawaban model asli.
+
+MOCK_API_KEY = "mock"
+
+
+def mock_backend_enabled():
+    return os.environ.get("NOTULEN_BACKEND", "gemini") == "mock"
+
+
+class Backend(ABC):
+    # None = jawaban Gemini asli; backend lain wajib mengisi namespace cache sendiri
+    cache_namespace = None
+
+    @abstractmethod
+    def stream(self, model_name, api_key, prompt_text, generation_config, safety_settings):
+        """Hasilkan potongan (teks, finish_reason) untuk satu model.
+
+        finish_reason bernilai None sampai potongan terakhir. Kegagalan sebelum token
+        pertama dilempar sebagai exception agar pemanggil bisa pindah ke model berikutnya.
+        """
+
+    def generate(self, model_name, api_key, prompt_text, generation_config, safety_settings):
+        parts, finish_reason = [], None
+        for text, reason in self.stream(model_name, api_key, prompt_text, generation_config, safety_settings):
+            parts.append(text)
+            finish_reason = reason or finish_reason
+        return "".join(parts), finish_reason
+
+
+class GeminiBackend(Backend):
+    def __init__(self, registry):
+        self.registry = registry
+
+    def generate(self, model_name, api_key, prompt_text, generation_config, safety_settings):
+        model = self.registry.get_model(model_name, api_key)
+        response = model.generate_content(
+            prompt_text,
+            generation_config=generation_config,
+            safety_settings=safety_settings
+        )
+        finish_reason = None
+        if response.candidates and response.candidates[0].finish_reason:
+            finish_reason = response.candidates[0].finish_reason.name
+        if finish_reason == 'MAX_TOKENS':
+            return "", finish_reason
+        return response.text, finish_reason
+
+    def stream(self, model_name, api_key, prompt_text, generation_config, safety_settings):
+        model = self.registry.get_model(model_name, api_key)
+        response = model.generate_content(
+            prompt_text,
+            generation_config=generation_config,
+            safety_settings=safety_settings,
+            stream=True
+        )
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Potongan tanpa parts (mis. hanya berisi finish_reason)
+                text = ""
+            finish_reason = None
+            if chunk.candidates and chunk.candidates[0].finish_reason:
+                finish_reason = chunk.candidates[0].finish_reason.name
+            yield text, finish_reason
+
+
+def not_found_error(model_name):
+    return Exception(f"404 models/{model_name.split('/')[-1]} is not found for API version v1beta")
+
+
+def quota_error(retry_after=None):
+    hint = f" Please retry in {retry_after}s." if retry_after is not None else ""
+    return Exception(f"429 Resource has been exhausted (e.g. check quota).{hint}")
+
+
+class FakeReply:
+    __slots__ = ("text", "finish_reason", "error", "fail_after")
+
+    def __init__(self, text="", finish_reason="STOP", error=None, fail_after=None):
+        self.text = text
+        self.finish_reason = finish_reason
+        self.error = error
+        self.fail_after = fail_after  # jumlah karakter terkirim sebelum error dilempar
+
+
+class FakeStreamingBackend(Backend):
+    # Backend lokal deterministik untuk menguji streaming & fallback tanpa API key.
+    # replies: {nama_model: balasan}; model lain memakai default. Balasan berupa FakeReply,
+    # str, Exception, callable(prompt) yang mengembalikan salah satunya, atau list berisi
+    # balasan berurutan per panggilan (elemen terakhir dipakai terus, mis. [quota_error(), "ok"]).
+    # latency: {nama_model: detik | callable tanpa argumen} untuk menyuntikkan distribusi
+    # latensi (mis. lambda: random.lognormvariate(0, 1)); menggantikan first_token_delay.
+    cache_namespace = "fake"
+
+    def __init__(self, replies=None, default=None, chunk_size=16, first_token_delay=0.0, chunk_delay=0.0, latency=None):
+        self.replies = replies or {}
+        self.latency = latency or {}
+        self.default = default if default is not None else FakeReply(error=Exception("404 model not found"))
+        self.chunk_size = chunk_size
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _reply(self, model_name, prompt_text):
+        with self._lock:
+            call_index = self.calls.count(model_name)
+            self.calls.append(model_name)
+        reply = self.replies.get(model_name, self.default)
+        if isinstance(reply, list):
+            reply = reply[min(call_index, len(reply) - 1)]
+        if callable(reply) and not isinstance(reply, (FakeReply, Exception)):
+            reply = reply(prompt_text)
+        if isinstance(reply, str):
+            return FakeReply(reply)
+        if isinstance(reply, Exception):
+            return FakeReply(error=reply)
+        return reply
+
+    def _first_token_delay(self, model_name, prompt_text):
+        delay = self.latency.get(model_name, self.first_token_delay)
+        return delay() if callable(delay) else delay
+
+    def stream(self, model_name, api_key, prompt_text, generation_config, safety_settings):
+        reply = self._reply(model_name, prompt_text)
+        if reply.error is not None and reply.fail_after is None:
+            raise reply.error
+        time.sleep(self._first_token_delay(model_name, prompt_text))
+        for i in range(0, len(reply.text), self.chunk_size):
+            if reply.fail_after is not None and i >= reply.fail_after:
+                raise reply.error
+            if i:
+                time.sleep(self.chunk_delay)
+            yield reply.text[i:i + self.chunk_size], None
+        if reply.error is not None:
+            raise reply.error
+        yield "", reply.finish_reason
+
+
+# --- MOCK GEMINI: balasan notulen sintetis yang ukurannya mengikuti prompt ---
+
+MOCK_SPEAKER_RE = re.compile(r"^([A-Z][A-Za-z.]*(?: [A-Z][A-Za-z.]*){0,3}):\s", re.MULTILINE)
+MOCK_CHARS_PER_ROW = 2500
+MOCK_MAX_ROWS = 400
+
+
+def mock_notulen(prompt_text):
+    # Notulen berformat baku; satu baris diskusi per ~MOCK_CHARS_PER_ROW karakter prompt
+    names = (name for name in MOCK_SPEAKER_RE.findall(prompt_text) if not name.isupper())
+    speakers = list(dict.fromkeys(names))[:20] or ["Pemimpin Rapat"]
+    rows = max(1, min(MOCK_MAX_ROWS, len(prompt_text) // MOCK_CHARS_PER_ROW))
+    digest = hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()[:8]
+    lines = [
+        "# Notulen Rapat", "", "| Judul | Keterangan |", "|---|---|",
+        f"| Nama Rapat | Rapat Simulasi {digest} |", "| Hari/Tanggal | Senin, 1 Januari 2024 |",
+        "| Waktu | 09.00 - 10.00 WIB |", "| Tempat | Zoom Meeting |", f"| Pemimpin Rapat | {speakers[0]} |",
+        "| Dibuat oleh | Group Monitoring Evaluasi Strategi Perusahaan dan Inovasi |", "",
+        "**Agenda:**", "- Evaluasi kinerja operasional", "",
+        "**Peserta Rapat:**", "| No | Nama/Jabatan |", "|---|---|",
+        *(f"| {i} | {name} |" for i, name in enumerate(speakers, 1)), "",
+        "**Poin Diskusi dan Arahan:**", "| Pembahasan / Topik | Penanggung Jawab |", "|---|---|",
+    ]
+    for i in range(rows):
+        speaker = speakers[i % len(speakers)]
+        if i % 5 == 0:
+            lines.append(f"| **Topik Pembahasan {i // 5 + 1}** | |")
+        lines.append(f"| {speaker} menyampaikan:<br>• Realisasi throughput terminal mencapai {90 + i % 10} persen dari target "
+                     f"dengan catatan kesiapan alat dermaga dan koordinasi lintas divisi.<br>• Tindak lanjut ke-{i + 1} "
+                     f"dipantau pada rapat berikutnya. | {speakers[(i + 1) % len(speakers)]} |")
+    lines += ["", "**Disclaimer:**",
+              "_Jika tidak ada tanggapan dalam tiga hari sejak dokumen ini didistribusikan, maka dokumen ini dianggap final._"]
+    return "\n".join(lines)
+
+
+class MockGeminiBackend(FakeStreamingBackend):
+    # Semua model menjawab mock_notulen; latensi deterministik per (model, prompt):
+    # base_latency * (1 + jitter * u), u ∈ [0, 1) dari hash prompt
+    cache_namespace = "mock"
+
+    def __init__(self, replies=None, base_latency=0.05, jitter=0.5, chunk_size=64, chunk_delay=0.0):
+        super().__init__(replies, default=mock_notulen, chunk_size=chunk_size, chunk_delay=chunk_delay)
+        self.base_latency = base_latency
+        self.jitter = jitter
+
+    def _first_token_delay(self, model_name, prompt_text):
+        if model_name in self.latency:
+            return super()._first_token_delay(model_name, prompt_text)
+        u = int(hashlib.sha256(f"{model_name}|{prompt_text}".encode("utf-8")).hexdigest()[:8], 16) / 2 ** 32
+        return self.base_latency * (1 + self.jitter * u)
+
+
+def get_backend(registry):
+    if mock_backend_enabled():
+        return MockGeminiBackend()
+    return GeminiBackend(registry)
@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from notulen.archive import KIND_NOTULEN, archive_key, archive_result
+from notulen.backends import MOCK_API_KEY, mock_backend_enabled
+from notulen.compact import compact_text
+from notulen.engine import generate_with_fallback
+from notulen.export import create_pdf_document, create_word_document
+from notulen.hedged import generate_hedged_blocking
+from notulen.summarize import summarize_transcript
+from notulen.vtt import process_vtt_text
+
+# ==============================================================================
+# MODE BATCH HEADLESS: python -m notulen.batch <folder|glob> --out <folder>
+# ==============================================================================
+# Parsing & ekspor berjalan di process pool, pemanggilan LLM di asyncio dengan
+# konkurensi terbatas + rate limiter per request. Berkas yang sudah selesai
+# (hash input sama & output ada) dilewati sehingga batch bisa dilanjutkan.
+
+MANIFEST_NAME = "batch_manifest.json"
+INPUT_EXTENSIONS = (".vtt", ".txt")
+
+
+class RateLimiter:
+    # Jarak minimum antar request LLM (thread-safe; dipanggil dari worker map-reduce)
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def collect_inputs(target):
+    if os.path.isdir(target):
+        paths = [os.path.join(target, name) for name in os.listdir(target)]
+    else:
+        paths = glob.glob(target, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p) and p.lower().endswith(INPUT_EXTENSIONS))
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def input_keys(paths):
+    # Kunci manifest & nama output = path relatif terhadap folder induk bersama, sehingga
+    # berkas bernama sama di subfolder berbeda (glob rekursif) tidak saling menimpa
+    if not paths:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    return {p: os.path.relpath(os.path.abspath(p), root).replace(os.sep, "/") for p in paths}
+
+
+def output_stems(keys):
+    # rapat.vtt & rapat.txt di folder yang sama: ekstensi sumber ikut di nama output
+    stems = {key: os.path.splitext(key)[0] for key in keys}
+    counts = {}
+    for stem in stems.values():
+        counts[stem] = counts.get(stem, 0) + 1
+    return {key: stem if counts[stem] == 1 else f"{stem}_{os.path.splitext(key)[1].lstrip('.')}" for key, stem in stems.items()}
+
+
+def output_paths(out_dir, stem):
+    base = os.path.join(out_dir, *stem.split("/"))
+    return {ext: f"{base}.{ext}" for ext in ("md", "docx", "pdf")}
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def is_done(manifest, key, digest, outputs):
+    entry = manifest.get(key)
+    return bool(entry) and entry.get("sha256") == digest and all(os.path.exists(p) for p in outputs.values())
+
+
+def parse_file(path, compact=True):
+    # Dijalankan di process pool
+    with open(path, "rb") as f:
+        text = process_vtt_text(f)
+    if compact:
+        text, _ = compact_text(text)
+    return "SUMBER 1 (TRANSKRIP OTOMATIS):\n" + text + "\n\n"
+
+
+def export_files(content, outputs):
+    # Dijalankan di process pool; .md ditulis terakhir sebagai penanda selesai
+    os.makedirs(os.path.dirname(outputs["md"]) or ".", exist_ok=True)
+    with open(outputs["docx"], "wb") as f:
+        f.write(create_word_document(content).getvalue())
+    with open(outputs["pdf"], "wb") as f:
+        f.write(create_pdf_document(content))
+    with open(outputs["md"], "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+async def run_batch(paths, out_dir, api_key, concurrency=2, requests_per_minute=30, map_workers=2, processes=None, use_cache=True, hedge=False, compact=True):
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    limiter = RateLimiter(requests_per_minute)
+    generate = generate_hedged_blocking if hedge else generate_with_fallback
+
+    def limited_generate(prompt_text, api_key, **kwargs):
+        limiter.acquire()
+        return generate(prompt_text, api_key, **kwargs)
+
+    keys = input_keys(paths)
+    stems = output_stems(keys.values())
+    pending = []
+    for path in paths:
+        key = keys[path]
+        digest = file_hash(path)
+        outputs = output_paths(out_dir, stems[key])
+        if is_done(manifest, key, digest, outputs):
+            print(f"[lewati] {path} (sudah selesai)")
+        else:
+            pending.append((path, key, digest, outputs))
+    if not pending:
+        return manifest
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    manifest_lock = asyncio.Lock()
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        async def process(path, key, digest, outputs):
+            # Kegagalan satu berkas (tidak terbaca, gagal ekspor) tidak menghentikan batch
+            try:
+                return await process_file(path, key, digest, outputs)
+            except Exception as e:
+                print(f"[gagal]  {path}: {e}", file=sys.stderr)
+                return False
+
+        async def process_file(path, key, digest, outputs):
+            started = time.monotonic()
+            transcript = await loop.run_in_executor(pool, parse_file, path, compact)
+            async with semaphore:
+                res = await asyncio.to_thread(
+                    summarize_transcript, transcript, api_key,
+                    max_workers=map_workers, generate=limited_generate, use_cache=use_cache
+                )
+            if not res["success"]:
+                print(f"[gagal]  {path}: {res['error']}", file=sys.stderr)
+                return False
+            await loop.run_in_executor(pool, export_files, res["content"], outputs)
+            await asyncio.to_thread(archive_result, archive_key(KIND_NOTULEN, transcript), KIND_NOTULEN, res, transcript)
+            async with manifest_lock:
+                manifest[key] = {
+                    "sha256": digest,
+                    "model": res.get("model"),
+                    "outputs": {ext: os.path.relpath(p, out_dir).replace(os.sep, "/") for ext, p in outputs.items()},
+                    "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+                save_manifest(out_dir, manifest)
+            print(f"[selesai] {path} -> {outputs['docx']} ({time.monotonic() - started:.1f} dtk, {res.get('model')})")
+            return True
+
+        await asyncio.gather(*(process(*item) for item in pending))
+    return manifest
+
+
+def read_api_key(explicit=None):
+    if explicit:
+        return explicit
+    if os.environ.get("GEMINI_API_KEY"):
+        return os.environ["GEMINI_API_KEY"]
+    try:
+        import tomllib
+        with open(os.path.join(".streamlit", "secrets.toml"), "rb") as f:
+            return tomllib.load(f).get("api_key")
+    except (OSError, ValueError, ImportError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m notulen.batch", description="Proses banyak transkrip VTT/TXT menjadi notulen .docx/.pdf.")
+    parser.add_argument("target", help="Folder berisi .vtt/.txt atau pola glob (mis. 'rekaman/**/*.vtt')")
+    parser.add_argument("--out", default="notulen_output", help="Folder output (default: notulen_output)")
+    parser.add_argument("--api-key", help="API key Gemini (default: $GEMINI_API_KEY atau .streamlit/secrets.toml)")
+    parser.add_argument("--concurrency", type=int, default=2, help="Jumlah transkrip yang dirangkum bersamaan")
+    parser.add_argument("--rpm", type=int, default=30, help="Batas request LLM per menit (0 = tanpa batas)")
+    parser.add_argument("--map-workers", type=int, default=2, help="Worker map-reduce per transkrip")
+    parser.add_argument("--processes", type=int, default=None, help="Jumlah proses untuk parsing & ekspor")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass cache respons LLM")
+    parser.add_argument("--no-compact", action="store_true", help="Kirim transkrip apa adanya (tanpa membuang filler & duplikat)")
+    parser.add_argument("--hedge", action="store_true", help="Kirim request cadangan ke model berikutnya bila model utama lambat")
+    args = parser.parse_args(argv)
+
+    api_key = read_api_key(args.api_key) or (MOCK_API_KEY if mock_backend_enabled() else None)
+    if not api_key:
+        parser.error("API key tidak ditemukan. Gunakan --api-key atau set GEMINI_API_KEY.")
+    paths = collect_inputs(args.target)
+    if not paths:
+        parser.error(f"Tidak ada berkas .vtt/.txt di {args.target}")
+
+    manifest = asyncio.run(run_batch(
+        paths, args.out, api_key,
+        concurrency=args.concurrency, requests_per_minute=args.rpm, map_workers=args.map_workers,
+        processes=args.processes, use_cache=not args.no_cache, hedge=args.hedge, compact=not args.no_compact
+    ))
+    finished = sum(1 for key in input_keys(paths).values() if key in manifest)
+    print(f"{finished}/{len(paths)} berkas selesai. Output: {args.out}")
+    return 0 if finished == len(paths) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
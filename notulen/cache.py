@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from notulen.storage import DATA_DIR, ProcessSingleton, SQLiteStore
+
+# ==============================================================================
+# CACHE RESPONS LLM (CONTENT-ADDRESSED, PERSISTEN DI DISK)
+# ==============================================================================
+# Kunci = sha256(prompt, nama model, generation_config). Disimpan di SQLite agar
+# bertahan lintas rerun/proses, dengan TTL dan eviksi LRU berdasarkan jumlah
+# entri maupun total ukuran.
+
+CACHE_PATH = os.path.join(DATA_DIR, "llm_cache.sqlite3")
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+CACHE_MAX_ENTRIES = 2000
+CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# Set NOTULEN_CACHE=0 untuk mem-bypass cache di seluruh proses
+CACHE_ENABLED = os.environ.get("NOTULEN_CACHE", "1") != "0"
+
+
+def cache_key(prompt_text, model_name, generation_config, namespace=None):
+    # namespace = backend non-Gemini (mis. "mock"); None mempertahankan kunci jawaban Gemini
+    parts = [prompt_text, model_name, generation_config] + ([namespace] if namespace else [])
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(SQLiteStore):
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        super().__init__(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, content TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def lookup(self, prompt_text, model_names, generation_config, namespace=None):
+        # Cari jawaban tersimpan dari model mana pun dalam urutan fallback
+        keys = {cache_key(prompt_text, name, generation_config, namespace): name for name in model_names}
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT key, model, content, created FROM responses WHERE key IN ({','.join('?' * len(keys))})",
+                    list(keys),
+                ).fetchall()
+                fresh = {key: (model, content) for key, model, content, created in rows if now - created <= self.ttl}
+                stale = [key for key, _, _, created in rows if now - created > self.ttl]
+                if stale:
+                    conn.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in stale])
+                for key in keys:
+                    if key in fresh:
+                        conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                        self._count(True)
+                        model, content = fresh[key]
+                        return {"model": model, "content": content}
+        except sqlite3.Error:
+            pass
+        self._count(False)
+        return None
+
+    def put(self, prompt_text, model_name, generation_config, content, namespace=None):
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, content, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (cache_key(prompt_text, model_name, generation_config, namespace), model_name, content, size, now, now),
+                )
+                self._evict(conn, now)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Hapus entri yang paling lama tidak diakses sampai kembali di bawah batas
+        drop = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            drop.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", drop)
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        try:
+            with self._connect() as conn:
+                entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        except sqlite3.Error:
+            entries, total = 0, 0
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total}
+
+
+_cache = ProcessSingleton(ResponseCache, errors=(OSError, sqlite3.Error))
+
+
+def get_response_cache():
+    return _cache.get() if CACHE_ENABLED else None
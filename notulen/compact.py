@@ -0,0 +1,173 @@
+import re
+from collections import defaultdict, deque
+from difflib import SequenceMatcher
+
+from notulen.metrics import track
+from notulen.prompts import estimate_tokens
+from notulen.vtt import Cue, cues_to_text, parse_vtt
+
+# ==============================================================================
+# KOMPAKSI TRANSKRIP DETERMINISTIK (SEBELUM PROMPT DIBANGUN)
+# ==============================================================================
+# Mengurangi token tanpa memanggil LLM: membuang kata pengisi (filler), baris
+# duplikat/hampir duplikat dari pembicara yang sama, lalu menggabungkan cue
+# berurutan dari pembicara yang sama menjadi satu baris. Atribusi pembicara
+# tidak pernah diubah: teks hanya dihapus atau digabung dalam satu pembicara.
+
+# Filler murni: dibuang di posisi mana pun. Minimal dua huruf, agar huruf tunggal
+# seperti "Dermaga E" atau "gedung E" tidak ikut terhapus. Hanya huruf pertama yang
+# boleh kapital: singkatan kapital ("UM", "HM", "AH") adalah isi, bukan filler
+FILLERS = ("ee+h*m*", "ee*h+m*", "ee*m+", "hh*m+", "aa*h+", "uu*h+m*", "uu*m+", "anu")
+FILLER_RE = re.compile(rf"(?<!\w)(?:{'|'.join(f'(?i:{f[0]}){f[1:]}' for f in FILLERS)})(?!\w)[\s,.…]*")
+# Penanda wacana: hanya dibuang bila dipisah koma/elipsis di awal ucapan ("Jadi, ..."),
+# di antara koma, atau sebagai tag setelah koma di akhir ("..., ya." / "..., gitu.");
+# "Jadi tidak rapatnya?", "Ya atau tidak?", dan "Tidak begitu." tetap utuh
+DISCOURSE_MARKERS = ("jadi", "ya", "nah", "oke", "gitu", "begitu", "apa namanya", "istilahnya")
+TRAILING_MARKERS = ("ya", "gitu", "begitu", "nah")
+
+NEAR_DUP_RATIO = 0.85
+NEAR_DUP_MIN_WORDS = 4
+NEAR_DUP_LOOKBACK = 6
+EXACT_DUP_WINDOW = 50
+MERGE_MAX_CHARS = 1200
+
+NORMALIZE_RE = re.compile(r"[^\w\s]")
+
+
+def _markers(words):
+    return "|".join(re.escape(w).replace(r"\ ", r"\s+") for w in words)
+
+
+LEADING_RE = re.compile(rf"^(?:(?:{_markers(DISCOURSE_MARKERS)})\s*(?:,|…|\.\.\.)[\s,.…]*)+", re.IGNORECASE)
+INNER_RE = re.compile(rf",\s*(?:{_markers(DISCOURSE_MARKERS)})\s*,", re.IGNORECASE)
+TRAILING_RE = re.compile(rf"\s*,\s*(?:{_markers(TRAILING_MARKERS)})\s*([.?!]*)$", re.IGNORECASE)
+SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([,.?!])")
+
+
+def strip_fillers(text):
+    # Mengembalikan teks bersih; string kosong bila isinya hanya filler murni
+    cleaned = FILLER_RE.sub(" ", text)
+    cleaned = INNER_RE.sub(",", cleaned)
+    cleaned = TRAILING_RE.sub(r"\1", cleaned.strip())
+    without_leading = LEADING_RE.sub("", cleaned)
+    # Ucapan yang hanya berisi penanda wacana ("Ya.", "Oke") tetap dipertahankan sebagai jawaban
+    if without_leading.strip(" ,.…"):
+        cleaned = without_leading
+    cleaned = SPACE_BEFORE_PUNCT_RE.sub(r"\1", " ".join(cleaned.split())).strip(" ,")
+    if not cleaned.strip(" ,.…?!"):
+        return ""
+    if text[:1].isupper() and cleaned[:1].islower():
+        cleaned = cleaned[0].upper() + cleaned[1:]
+    return cleaned
+
+
+def normalize_words(text):
+    return NORMALIZE_RE.sub("", text.lower()).split()
+
+
+def _contains(haystack, needle):
+    return f" {' '.join(needle)} " in f" {' '.join(haystack)} "
+
+
+def compact_cues(cues, strip=True, dedupe=True, merge=True, merge_max_chars=MERGE_MAX_CHARS):
+    # Mengembalikan (cue baru, statistik); cue masukan tidak diubah
+    cues = list(cues)
+    before = cues_to_text(cues)
+    kept = []
+    stats = {"fillers_removed": 0, "duplicates_removed": 0, "merged": 0}
+    last_exact = {}  # (pembicara, teks ternormalisasi) -> posisi cue terakhir
+    recent = defaultdict(lambda: deque(maxlen=NEAR_DUP_LOOKBACK))  # pembicara -> indeks kept
+
+    for position, cue in enumerate(cues):
+        text = cue.text
+        if strip and text:
+            stripped = strip_fillers(text)
+            if stripped != text:
+                stats["fillers_removed"] += 1
+            text = stripped
+        if not text:
+            continue
+
+        if dedupe:
+            words = normalize_words(text)
+            key = (cue.speaker, " ".join(words))
+            seen = last_exact.get(key)
+            # Ucapan pendek ("Setuju.") hanya dianggap duplikat bila langsung berulang
+            window = EXACT_DUP_WINDOW if len(words) >= NEAR_DUP_MIN_WORDS else 1
+            last_exact[key] = position
+            if seen is not None and position - seen <= window:
+                stats["duplicates_removed"] += 1
+                continue
+            if len(words) >= NEAR_DUP_MIN_WORDS and _absorb_near_duplicate(kept, recent[cue.speaker], words, text):
+                stats["duplicates_removed"] += 1
+                continue
+            recent[cue.speaker].append(len(kept))
+
+        kept.append(Cue(cue.start, cue.end, cue.speaker, text))
+
+    if merge:
+        kept, stats["merged"] = _merge_speakers(kept, merge_max_chars)
+
+    after = cues_to_text(kept)
+    stats.update({
+        "cues_before": len(cues), "cues_after": len(kept),
+        "chars_before": len(before), "chars_after": len(after),
+        "tokens_before": estimate_tokens(before), "tokens_after": estimate_tokens(after),
+    })
+    stats["ratio"] = stats["chars_after"] / stats["chars_before"] if stats["chars_before"] else 1.0
+    return kept, stats
+
+
+def _absorb_near_duplicate(kept, recent_indices, words, text):
+    # True bila ucapan ini (hampir) sama dengan ucapan terbaru pembicara yang sama;
+    # versi yang lebih lengkap disimpan di posisi cue yang lama
+    for index in reversed(recent_indices):
+        previous = kept[index]
+        previous_words = normalize_words(previous.text)
+        if _contains(previous_words, words):
+            return True
+        if _contains(words, previous_words):
+            previous.text = text
+            return True
+        matcher = SequenceMatcher(None, previous_words, words, autojunk=False)
+        if (matcher.real_quick_ratio() >= NEAR_DUP_RATIO and matcher.quick_ratio() >= NEAR_DUP_RATIO
+                and matcher.ratio() >= NEAR_DUP_RATIO):
+            if len(words) > len(previous_words):
+                previous.text = text
+            return True
+    return False
+
+
+def _merge_speakers(cues, max_chars):
+    merged, count = [], 0
+    for cue in cues:
+        prev = merged[-1] if merged else None
+        if (prev is not None and cue.speaker is not None and prev.speaker == cue.speaker
+                and len(prev.text) + len(cue.text) < max_chars):
+            prev.text = f"{prev.text} {cue.text}"
+            if cue.end is not None:
+                prev.end = cue.end if prev.end is None else max(prev.end, cue.end)
+            count += 1
+            continue
+        merged.append(cue)
+    return merged, count
+
+
+def compact_transcript(cues, **options):
+    # Kompaksi + pencatatan metrik; mengembalikan (teks siap prompt, statistik)
+    with track("compact_transcript") as event:
+        compacted, stats = compact_cues(cues, **options)
+        text = cues_to_text(compacted)
+        event.update(chars_in=stats["chars_before"], chars_out=stats["chars_after"], ratio=round(stats["ratio"], 4))
+    return text, stats
+
+
+def compact_text(text, **options):
+    # Untuk transkrip yang sudah berupa teks "Pembicara: ucapan" per baris
+    return compact_transcript(parse_vtt(text, collapse=False), **options)
+
+
+def compaction_summary(stats):
+    saved = 1 - stats["ratio"]
+    return (f"Transkrip diringkas {stats['chars_before']:,} → {stats['chars_after']:,} karakter "
+            f"(−{saved:.0%}), ~{stats['tokens_before']:,} → ~{stats['tokens_after']:,} token")
@@ -0,0 +1,105 @@
+import re
+from functools import lru_cache
+
+# ==============================================================================
+# REPRESENTASI ANTARA (IR) MARKDOWN NOTULEN
+# ==============================================================================
+# Markdown hasil AI di-parse sekali menjadi pohon dokumen ringkas lalu dipakai
+# bersama oleh renderer Word, PDF, maupun eksporter lain.
+# Run inline = tuple (teks, tebal); "<br>" sudah diubah menjadi "\n".
+
+DOCUMENT_TITLE = "Notulen Rapat"
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+TABLE_SEPARATOR_RE = re.compile(r"^\|[-:\s|]+\|$")
+BOLD_RE = re.compile(r"(\*\*.*?\*\*)")
+BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+
+
+class Heading:
+    __slots__ = ("level", "runs")
+
+    def __init__(self, level, runs):
+        self.level = level
+        self.runs = runs
+
+
+class Paragraph:
+    __slots__ = ("runs",)
+
+    def __init__(self, runs):
+        self.runs = runs
+
+
+class BulletList:
+    __slots__ = ("items",)
+
+    def __init__(self, items):
+        self.items = items
+
+
+class Table:
+    __slots__ = ("rows", "cols")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.cols = max(len(row) for row in rows)
+
+
+def parse_inline(text):
+    text = BR_RE.sub("\n", text)
+    runs = []
+    for part in BOLD_RE.split(text):
+        if not part:
+            continue
+        if part.startswith("**") and part.endswith("**") and len(part) >= 4:
+            runs.append((part[2:-2], True))
+        else:
+            runs.append((part, False))
+    return tuple(runs)
+
+
+def runs_text(runs):
+    return "".join(text for text, _ in runs)
+
+
+@lru_cache(maxsize=32)
+def parse_markdown(content):
+    # Hasil di-cache per isi konten; node tidak boleh dimodifikasi oleh renderer
+    blocks = []
+    table_rows, bullets = [], []
+
+    def flush():
+        if table_rows:
+            blocks.append(Table(tuple(table_rows)))
+            table_rows.clear()
+        if bullets:
+            blocks.append(BulletList(tuple(bullets)))
+            bullets.clear()
+
+    for line in content.split("\n"):
+        line = line.strip()
+        if line.startswith("|") and line.endswith("|") and len(line) > 1:
+            if bullets:
+                flush()
+            if TABLE_SEPARATOR_RE.match(line):
+                continue
+            table_rows.append(tuple(parse_inline(cell.strip()) for cell in line.strip("|").split("|")))
+            continue
+        if line.startswith("- ") or line.startswith("* "):
+            if table_rows:
+                flush()
+            bullets.append(parse_inline(line[2:]))
+            continue
+        flush()
+
+        if not line:
+            continue
+        m = HEADING_RE.match(line)
+        if m:
+            if m.group(2).strip() != DOCUMENT_TITLE:
+                blocks.append(Heading(len(m.group(1)), parse_inline(m.group(2).strip())))
+        else:
+            blocks.append(Paragraph(parse_inline(line)))
+    flush()
+    return tuple(blocks)
@@ -0,0 +1,191 @@
+import time
+
+from notulen.backends import get_backend
+from notulen.cache import get_response_cache
+from notulen.metrics import track, track_result
+from notulen.prompts import estimate_tokens
+from notulen.registry import MAX_QUOTA_WAIT, get_model_registry
+
+# ==============================================================================
+# AI CORE ENGINE (SMART FALLBACK)
+# ==============================================================================
+
+FALLBACK_MODELS = [
+    "models/gemini-3.5-flash",
+    "models/gemini-3.1-flash-lite",
+    "models/gemini-2.5-flash",
+    "models/gemini-2.5-pro",
+    "models/gemini-2.5-flash-lite"
+]
+
+GENERATION_CONFIG = {"temperature": 0.1, "top_p": 0.95, "top_k": 40, "max_output_tokens": 8192}
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"}
+]
+
+
+def candidate_models(registry):
+    candidates = registry.candidates()
+    if candidates:
+        return candidates
+    # Semua model sedang diistirahatkan: tunggu model kuota yang paling cepat pulih, atau coba ulang semua
+    pending = registry.next_rate_limited()
+    if pending and pending[0] <= MAX_QUOTA_WAIT:
+        time.sleep(pending[0])
+        return [pending[1]]
+    return list(FALLBACK_MODELS)
+
+
+def generate_with_fallback(prompt_text, api_key, fallback_on_max_tokens=True, use_cache=True, backend=None, registry=None):
+    # fallback_on_max_tokens=False: MAX_TOKENS langsung dikembalikan (dengan flag "max_tokens")
+    # karena semua model memakai max_output_tokens yang sama, sehingga pemanggil bisa memecah prompt
+    with track("generate_with_fallback", chars_in=len(prompt_text), attempts=0) as event:
+        res = _generate_with_fallback(prompt_text, api_key, fallback_on_max_tokens, use_cache, backend, registry, event)
+        return track_result(event, res)
+
+
+def _generate_with_fallback(prompt_text, api_key, fallback_on_max_tokens, use_cache, backend, registry, event):
+    registry = registry or get_model_registry(FALLBACK_MODELS)
+    backend = backend or get_backend(registry)
+    cache = get_response_cache() if use_cache else None
+    if cache:
+        hit = cache.lookup(prompt_text, FALLBACK_MODELS, GENERATION_CONFIG, backend.cache_namespace)
+        if hit:
+            return {"success": True, "content": hit["content"], "model": hit["model"], "cached": True}
+
+    last_error = None
+    waited = time.monotonic()
+    candidates = candidate_models(registry)
+    event["wait"] = time.monotonic() - waited
+    for model_name in candidates:
+        event["attempts"] += 1
+        try:
+            start = time.monotonic()
+            text, finish_reason = backend.generate(model_name, api_key, prompt_text, GENERATION_CONFIG, SAFETY_SETTINGS)
+            latency = time.monotonic() - start
+
+            if finish_reason == 'MAX_TOKENS':
+                # Model sehat, hanya output yang kepanjangan
+                registry.record_success(model_name, latency)
+                if not fallback_on_max_tokens:
+                    return {"success": False, "max_tokens": True, "error": f"Output {model_name} melebihi batas token (MAX_TOKENS)."}
+                last_error = "MAX_TOKENS_REACHED"
+                continue
+
+            if text:
+                registry.record_success(model_name, latency)
+                if cache:
+                    cache.put(prompt_text, model_name, GENERATION_CONFIG, text, backend.cache_namespace)
+                return {"success": True, "content": text, "model": model_name, "cached": False}
+
+        except Exception as e:
+            last_error = str(e)
+            registry.record_failure(model_name, last_error)
+
+    return {"success": False, "error": f"Semua model gagal merespon. Error: {last_error}"}
+
+
+# ==============================================================================
+# STREAMING (TOKEN DIKIRIM BERTAHAP KE UI)
+# ==============================================================================
+
+
+class GenerationStream:
+    # Iterator potongan teks; setelah habis, .result berisi dict seperti generate_with_fallback
+    # plus metrik "ttft" (detik sampai token pertama) dan "tokens_per_sec".
+    def __init__(self, prompt_text, api_key, use_cache=True, backend=None, registry=None):
+        self.prompt_text = prompt_text
+        self.api_key = api_key
+        self.use_cache = use_cache
+        self.registry = registry or get_model_registry(FALLBACK_MODELS)
+        self.backend = backend or get_backend(self.registry)
+        self.result = None
+        self._chunks = self._run()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._chunks)
+
+    def consume(self):
+        for _ in self:
+            pass
+        return self.result
+
+    def _finish(self, content, model_name, started, first_token_at, cached=False):
+        finished = time.monotonic()
+        ttft = (first_token_at - started) if first_token_at else None
+        streaming_time = finished - first_token_at if first_token_at else 0
+        self.result = {
+            "success": True, "content": content, "model": model_name, "cached": cached,
+            "ttft": ttft,
+            "tokens_per_sec": estimate_tokens(content) / streaming_time if streaming_time > 0 else None
+        }
+
+    def _run(self):
+        # status "incomplete" tersisa bila iterator ditinggalkan sebelum stream selesai
+        with track("stream_with_fallback", chars_in=len(self.prompt_text), attempts=0, status="incomplete") as event:
+            yield from self._stream(event)
+            if self.result:
+                track_result(event, self.result)
+                event["ttft"] = self.result.get("ttft")
+
+    def _stream(self, event):
+        started = time.monotonic()
+        cache = get_response_cache() if self.use_cache else None
+        if cache:
+            hit = cache.lookup(self.prompt_text, FALLBACK_MODELS, GENERATION_CONFIG, self.backend.cache_namespace)
+            if hit:
+                yield hit["content"]
+                self._finish(hit["content"], hit["model"], started, time.monotonic(), cached=True)
+                return
+
+        last_error = None
+        waited = time.monotonic()
+        candidates = candidate_models(self.registry)
+        event["wait"] = time.monotonic() - waited
+        for model_name in candidates:
+            event["attempts"] += 1
+            attempt_start = time.monotonic()
+            first_token_at = None
+            parts = []
+            finish_reason = None
+            try:
+                for text, reason in self.backend.stream(model_name, self.api_key, self.prompt_text, GENERATION_CONFIG, SAFETY_SETTINGS):
+                    if text:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
+                        parts.append(text)
+                        yield text
+                    finish_reason = reason or finish_reason
+            except Exception as e:
+                last_error = str(e)
+                self.registry.record_failure(model_name, last_error)
+                if parts:
+                    # Token sudah tampil di UI: tidak bisa pindah model di tengah jawaban
+                    self.result = {"success": False, "content": "".join(parts), "model": model_name,
+                                   "error": f"Streaming {model_name} terputus. Error: {last_error}"}
+                    return
+                continue
+
+            self.registry.record_success(model_name, time.monotonic() - attempt_start)
+            content = "".join(parts)
+            if finish_reason == 'MAX_TOKENS':
+                self.result = {"success": False, "max_tokens": True, "content": content, "model": model_name,
+                               "error": f"Output {model_name} melebihi batas token (MAX_TOKENS)."}
+                return
+            if content:
+                if cache:
+                    cache.put(self.prompt_text, model_name, GENERATION_CONFIG, content, self.backend.cache_namespace)
+                self._finish(content, model_name, started, first_token_at)
+                return
+
+        self.result = {"success": False, "error": f"Semua model gagal merespon. Error: {last_error}"}
+
+
+def stream_with_fallback(prompt_text, api_key, use_cache=True, backend=None, registry=None):
+    return GenerationStream(prompt_text, api_key, use_cache=use_cache, backend=backend, registry=registry)
@@ -0,0 +1,200 @@
+import io
+from functools import lru_cache
+
+from notulen.document import DOCUMENT_TITLE, BulletList, Heading, Table, parse_markdown, runs_text
+from notulen.metrics import timed
+
+# ==============================================================================
+# RENDERER WORD & PDF (MEMAKAI IR DARI notulen.document)
+# ==============================================================================
+# python-docx dan fpdf di-import saat ekspor pertama, bukan saat aplikasi start.
+
+
+def _add_runs(paragraph, runs):
+    for text, bold in runs:
+        run = paragraph.add_run(text)
+        if bold:
+            run.bold = True
+
+
+def _add_word_table(doc, table_block):
+    table = doc.add_table(rows=len(table_block.rows), cols=table_block.cols)
+    table.style = 'Table Grid'
+    # Isi per baris lewat row.cells (sekali per baris) alih-alih table.cell(i, j) yang memindai ulang grid
+    for row, row_data in zip(table.rows, table_block.rows):
+        for cell, runs in zip(row.cells, row_data):
+            if len(runs) == 1 and not runs[0][1]:
+                cell.text = runs[0][0]
+            elif runs:
+                _add_runs(cell.paragraphs[0], runs)
+
+
+@timed("create_word_document", chars_in=len, bytes_out=lambda buffer: buffer.getbuffer().nbytes)
+def create_word_document(content):
+    from docx import Document
+    from docx.shared import Inches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = section.bottom_margin = section.left_margin = section.right_margin = Inches(1)
+
+    title = doc.add_heading(DOCUMENT_TITLE, level=0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    doc.add_paragraph()
+
+    blocks = parse_markdown(content)
+    for i, block in enumerate(blocks):
+        if isinstance(block, Table):
+            _add_word_table(doc, block)
+            if i < len(blocks) - 1:
+                doc.add_paragraph()
+        elif isinstance(block, Heading):
+            doc.add_heading(runs_text(block.runs), level=min(block.level, 9))
+        elif isinstance(block, BulletList):
+            for item in block.items:
+                _add_runs(doc.add_paragraph(style='List Bullet'), item)
+        else:
+            _add_runs(doc.add_paragraph(), block.runs)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+# --- NORMALISASI UNICODE SANGAT KETAT UNTUK FPDF ---
+# Mengganti karakter khusus AI menjadi karakter Latin-1 standar
+PDF_REPLACEMENTS = {
+    '“': '"', '”': '"', '‘': "'", '’': "'",
+    '–': '-', '—': '-', '•': '-', '…': '...',
+    '\u200b': '', '\xa0': ' '
+}
+PDF_LINE_HEIGHT = 8
+PDF_TABLE_LINE_HEIGHT = 6
+
+
+def _latin1(text):
+    for k, v in PDF_REPLACEMENTS.items():
+        text = text.replace(k, v)
+    # Paksa buang sisa Unicode aneh yang tidak terdeteksi (diubah jadi '?')
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+
+@lru_cache(maxsize=None)
+def _pdf_class():
+    from fpdf import FPDF
+
+    class PDF(FPDF):
+        def header(self):
+            self.set_font('Arial', 'B', 15)
+            self.cell(0, 10, DOCUMENT_TITLE, 0, 1, 'C')
+            self.ln(5)
+            self.body_top = self.get_y()
+
+    return PDF
+
+
+def _pdf_write_runs(pdf, runs, size=11, prefix=""):
+    if prefix:
+        pdf.set_font("Arial", size=size)
+        pdf.write(PDF_LINE_HEIGHT, prefix)
+    for text, bold in runs:
+        pdf.set_font("Arial", 'B' if bold else '', size)
+        pdf.write(PDF_LINE_HEIGHT, _latin1(text))
+    pdf.ln(PDF_LINE_HEIGHT)
+    pdf.set_font("Arial", size=11)
+
+
+def _pdf_wrap(pdf, text, width):
+    # Word wrap seperti multi_cell (kata yang lebih lebar dari kolom dipotong per karakter);
+    # baris dihitung sendiri agar sel yang lebih tinggi dari satu halaman bisa dipecah
+    usable = width - 2 * pdf.c_margin
+    space = pdf.get_string_width(' ')
+    lines = []
+    for paragraph in text.split('\n'):
+        line, line_w = [], 0
+        for word in paragraph.split(' '):
+            word_w = pdf.get_string_width(word)
+            if line and line_w + space + word_w <= usable:
+                line.append(word)
+                line_w += space + word_w
+                continue
+            if line:
+                lines.append(' '.join(line))
+            while word_w > usable:
+                cut, cut_w = 0, 0
+                while cut < len(word) and cut_w + pdf.get_string_width(word[cut]) <= usable:
+                    cut_w += pdf.get_string_width(word[cut])
+                    cut += 1
+                cut = max(cut, 1)
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_w = pdf.get_string_width(word)
+            line, line_w = [word], word_w
+        lines.append(' '.join(line))
+    return lines
+
+
+def _pdf_table(pdf, table_block):
+    usable = pdf.w - pdf.l_margin - pdf.r_margin
+    rows = [[_latin1(runs_text(cell)) for cell in row] + [""] * (table_block.cols - len(row)) for row in table_block.rows]
+    bold = [[bool(cell) and all(b for _, b in cell) for cell in row] + [False] * (table_block.cols - len(row)) for row in table_block.rows]
+
+    # Lebar kolom proporsional terhadap panjang isi (dibatasi agar kolom sempit tetap terbaca)
+    weights = [min(max(max(len(row[j]) for row in rows), 4), 60) for j in range(table_block.cols)]
+    widths = [usable * w / sum(weights) for w in weights]
+
+    page_lines = int((pdf.page_break_trigger - pdf.body_top) // PDF_TABLE_LINE_HEIGHT)
+    for row, row_bold in zip(rows, bold):
+        cells = []
+        for text, is_bold, width in zip(row, row_bold, widths):
+            pdf.set_font("Arial", 'B' if is_bold else '', 10)
+            cells.append(_pdf_wrap(pdf, text, width))
+        total = max(len(lines) for lines in cells)
+        remaining = int((pdf.page_break_trigger - pdf.get_y()) // PDF_TABLE_LINE_HEIGHT)
+        # Baris yang muat satu halaman dipindah utuh; baris yang lebih tinggi dipecah per halaman
+        if total > remaining and (total <= page_lines or remaining < 1):
+            pdf.add_page()
+
+        start = 0
+        while start < total:
+            y = pdf.get_y()
+            count = min(total - start, int((pdf.page_break_trigger - y) // PDF_TABLE_LINE_HEIGHT))
+            x = pdf.l_margin
+            for lines, is_bold, width in zip(cells, row_bold, widths):
+                pdf.rect(x, y, width, count * PDF_TABLE_LINE_HEIGHT)
+                pdf.set_font("Arial", 'B' if is_bold else '', 10)
+                for i, line in enumerate(lines[start:start + count]):
+                    pdf.set_xy(x, y + i * PDF_TABLE_LINE_HEIGHT)
+                    pdf.cell(width, PDF_TABLE_LINE_HEIGHT, line)
+                x += width
+            start += count
+            pdf.set_xy(pdf.l_margin, y + count * PDF_TABLE_LINE_HEIGHT)
+            if start < total:
+                pdf.add_page()
+
+    pdf.set_font("Arial", size=11)
+    pdf.ln(4)
+
+
+@timed("create_pdf_document", chars_in=len, bytes_out=len)
+def create_pdf_document(content):
+    pdf = _pdf_class()()
+    pdf.add_page()
+    pdf.set_font("Arial", size=11)
+
+    for block in parse_markdown(content):
+        if isinstance(block, Table):
+            _pdf_table(pdf, block)
+        elif isinstance(block, Heading):
+            pdf.set_font("Arial", 'B', 12)
+            pdf.multi_cell(0, 10, txt=_latin1(runs_text(block.runs)))
+            pdf.set_font("Arial", size=11)
+        elif isinstance(block, BulletList):
+            for item in block.items:
+                _pdf_write_runs(pdf, item, prefix="- ")
+        else:
+            _pdf_write_runs(pdf, block.runs)
+
+    return pdf.output(dest='S').encode('latin-1', 'replace')
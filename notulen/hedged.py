@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from notulen.backends import get_backend
+from notulen.cache import get_response_cache
+from notulen.engine import FALLBACK_MODELS, GENERATION_CONFIG, SAFETY_SETTINGS, candidate_models
+from notulen.metrics import track, track_result
+from notulen.registry import get_model_registry
+
+# ==============================================================================
+# HEDGED REQUESTS (ASYNCIO) UNTUK MEMANGKAS TAIL LATENCY
+# ==============================================================================
+# Model utama dipanggil lebih dulu. Bila belum menjawab setelah HEDGE_DELAY
+# (atau p95 latensi model tersebut bila sudah ada cukup sampel), model
+# berikutnya dalam urutan kandidat ikut dijalankan paralel. Jawaban valid
+# pertama (bukan MAX_TOKENS) dipakai dan sisanya dibatalkan. Jumlah request
+# tambahan dibatasi MAX_EXTRA_REQUESTS demi keamanan kuota; failover karena
+# error tidak dihitung sebagai request tambahan.
+
+HEDGE_DELAY = 8.0
+MAX_EXTRA_REQUESTS = 1
+
+# Executor milik modul (bukan default executor loop) agar asyncio.run tidak ikut
+# menunggu attempt yang sudah dibatalkan tetapi thread-nya masih menunggu respons
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedged")
+
+
+def _complete(backend, model_name, api_key, prompt_text, cancelled):
+    # Dijalankan di thread; berhenti membaca stream bila attempt sudah dibatalkan
+    start = time.monotonic()
+    parts, finish_reason = [], None
+    for text, reason in backend.stream(model_name, api_key, prompt_text, GENERATION_CONFIG, SAFETY_SETTINGS):
+        if cancelled.is_set():
+            return None
+        parts.append(text)
+        finish_reason = reason or finish_reason
+    return "".join(parts), finish_reason, time.monotonic() - start
+
+
+def _hedge_delay(registry, model_name, hedge_delay):
+    if hedge_delay is not None:
+        return hedge_delay
+    p95 = registry.latency_quantile(model_name, 0.95)
+    return p95 if p95 is not None else HEDGE_DELAY
+
+
+async def generate_hedged(prompt_text, api_key, fallback_on_max_tokens=True, use_cache=True,
+                          hedge_delay=None, max_extra=MAX_EXTRA_REQUESTS, backend=None, registry=None):
+    with track("generate_hedged", chars_in=len(prompt_text)) as event:
+        res = await _generate_hedged(prompt_text, api_key, fallback_on_max_tokens, use_cache,
+                                     hedge_delay, max_extra, backend, registry)
+        event["attempts"] = res["attempts"]
+        event["hedged"] = res["hedged"]
+        return track_result(event, res)
+
+
+async def _generate_hedged(prompt_text, api_key, fallback_on_max_tokens, use_cache,
+                           hedge_delay, max_extra, backend, registry):
+    registry = registry or get_model_registry(FALLBACK_MODELS)
+    backend = backend or get_backend(registry)
+    cache = get_response_cache() if use_cache else None
+    if cache:
+        hit = cache.lookup(prompt_text, FALLBACK_MODELS, GENERATION_CONFIG, backend.cache_namespace)
+        if hit:
+            return {"success": True, "content": hit["content"], "model": hit["model"], "cached": True, "attempts": 0, "hedged": 0}
+
+    loop = asyncio.get_running_loop()
+    candidates = iter(await loop.run_in_executor(_executor, candidate_models, registry))
+
+    running = {}  # task -> (nama model, event pembatalan)
+    attempts, extra = 0, 0
+    last_error = None
+
+    def launch():
+        nonlocal attempts
+        model_name = next(candidates, None)
+        if model_name is None:
+            return None
+        cancelled = threading.Event()
+        task = loop.run_in_executor(_executor, _complete, backend, model_name, api_key, prompt_text, cancelled)
+        running[task] = (model_name, cancelled)
+        attempts += 1
+        return model_name
+
+    def cancel_all():
+        for task, (_, cancelled) in running.items():
+            cancelled.set()
+            task.cancel()
+        running.clear()
+
+    primary = launch()
+    try:
+        while running:
+            timeout = _hedge_delay(registry, primary, hedge_delay) if extra < max_extra else None
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                # Primary lambat (bukan gagal): jalankan model berikutnya secara paralel
+                if launch() is not None:
+                    extra += 1
+                else:
+                    max_extra = extra
+                continue
+
+            for task in done:
+                model_name, _ = running.pop(task)
+                try:
+                    outcome = task.result()
+                except Exception as e:
+                    last_error = str(e)
+                    registry.record_failure(model_name, last_error)
+                    continue
+                if outcome is None:
+                    continue
+                content, finish_reason, latency = outcome
+                registry.record_success(model_name, latency)
+                if finish_reason == 'MAX_TOKENS':
+                    last_error = "MAX_TOKENS_REACHED"
+                    if not fallback_on_max_tokens:
+                        cancel_all()
+                        return {"success": False, "max_tokens": True, "attempts": attempts, "hedged": extra,
+                                "error": f"Output {model_name} melebihi batas token (MAX_TOKENS)."}
+                    continue
+                if content:
+                    cancel_all()
+                    if cache:
+                        cache.put(prompt_text, model_name, GENERATION_CONFIG, content, backend.cache_namespace)
+                    return {"success": True, "content": content, "model": model_name, "cached": False,
+                            "attempts": attempts, "hedged": extra}
+
+            if not running:
+                # Semua attempt yang berjalan gagal: failover ke kandidat berikutnya
+                primary = launch() or primary
+    finally:
+        cancel_all()
+
+    return {"success": False, "attempts": attempts, "hedged": extra, "error": f"Semua model gagal merespon. Error: {last_error}"}
+
+
+def generate_hedged_blocking(prompt_text, api_key, **kwargs):
+    # Pengganti generate_with_fallback untuk pemanggil sinkron (mis. worker map-reduce)
+    return asyncio.run(generate_hedged(prompt_text, api_key, **kwargs))
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from notulen.archive import KIND_NOTULEN, KIND_REPAIR, archive_key, archive_result
+from notulen.engine import stream_with_fallback
+from notulen.metrics import track, track_result
+from notulen.rolling import summarize_incremental
+from notulen.storage import DATA_DIR, ProcessSingleton, SQLiteStore
+from notulen.summarize import build_source_text, summarize_transcript
+from notulen.vtt import Cue, cues_to_text
+
+# ==============================================================================
+# ANTREAN JOB LATAR BELAKANG (SQLITE + WORKER POOL)
+# ==============================================================================
+# Generate, Reparasi, dan chat dikirim sebagai job. Worker pool milik proses
+# (bukan thread skrip Streamlit) menjalankan pemanggilan LLM, menulis potongan
+# jawaban berkala ke SQLite, lalu menyimpan hasil akhir. UI hanya mem-poll status,
+# sehingga hasil bertahan saat rerun, reconnect, maupun refresh (id job disimpan
+# di URL). Job identik yang masih berjalan tidak dijalankan dua kali.
+# API key hanya disimpan di memori, tidak pernah ditulis ke berkas job.
+
+JOBS_PATH = os.path.join(DATA_DIR, "jobs.sqlite3")
+JOB_WORKERS = 3
+JOB_TTL_SECONDS = 7 * 24 * 3600
+PARTIAL_WRITE_INTERVAL = 0.5
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+
+def job_key(kind, payload):
+    encoded = json.dumps([kind, payload], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class JobStore(SQLiteStore):
+    def __init__(self, path=JOBS_PATH):
+        super().__init__(path)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, dedupe_key TEXT NOT NULL, status TEXT NOT NULL, "
+                "payload TEXT NOT NULL, partial TEXT NOT NULL DEFAULT '', result TEXT, "
+                "created REAL NOT NULL, started REAL, finished REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status)")
+            conn.execute("DELETE FROM jobs WHERE finished IS NOT NULL AND finished < ?", (time.time() - JOB_TTL_SECONDS,))
+
+    def create(self, kind, payload, dedupe_key):
+        # Mengembalikan (id, baru?) ; job aktif dengan kunci sama dipakai ulang
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ({','.join('?' * len(ACTIVE_STATUSES))}) "
+                "ORDER BY created LIMIT 1",
+                (dedupe_key, *ACTIVE_STATUSES),
+            ).fetchone()
+            if row:
+                return row[0], False
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, dedupe_key, status, payload, created) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, dedupe_key, QUEUED, json.dumps(payload, ensure_ascii=False), time.time()),
+            )
+            return job_id, True
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, kind, status, payload, partial, result, created, started, finished FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, kind, status, payload, partial, result, created, started, finished = row
+        return {"id": job_id, "kind": kind, "status": status, "payload": json.loads(payload), "partial": partial,
+                "result": json.loads(result) if result else None,
+                "created": created, "started": started, "finished": finished}
+
+    def start(self, job_id):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, started = ?, partial = '' WHERE id = ?", (RUNNING, time.time(), job_id))
+
+    def write_partial(self, job_id, text):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET partial = ? WHERE id = ?", (text, job_id))
+
+    def finish(self, job_id, result):
+        status = DONE if result.get("success") else FAILED
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, finished = ? WHERE id = ?",
+                (status, json.dumps(result, ensure_ascii=False), time.time(), job_id),
+            )
+
+    def unfinished(self):
+        with self._connect() as conn:
+            return [job_id for (job_id,) in conn.execute(
+                f"SELECT id FROM jobs WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))}) ORDER BY created",
+                ACTIVE_STATUSES,
+            )]
+
+
+class PartialWriter:
+    # Dipakai sebagai render_stream: konsumsi stream sambil menulis teks sementara ke store
+    def __init__(self, store, job_id):
+        self.store = store
+        self.job_id = job_id
+
+    def __call__(self, stream):
+        parts, written = [], 0.0
+        for chunk in stream:
+            parts.append(chunk)
+            if time.monotonic() - written >= PARTIAL_WRITE_INTERVAL:
+                self.store.write_partial(self.job_id, "".join(parts))
+                written = time.monotonic()
+        self.store.write_partial(self.job_id, "".join(parts))
+
+
+def _cues_from_payload(rows):
+    return [Cue(*row) for row in rows]
+
+
+def run_generate(payload, api_key, render_stream):
+    use_cache = payload.get("use_cache", True)
+    rolling = payload.get("rolling")
+    if not rolling:
+        res = summarize_transcript(payload["transcript"], api_key, use_cache=use_cache, render_stream=render_stream)
+        res["archive_id"] = archive_result(archive_key(KIND_NOTULEN, payload["transcript"]), KIND_NOTULEN, res, payload["transcript"])
+        return res
+
+    cues = _cues_from_payload(rolling["cues"])
+    manual_ids = {id(cues[i]) for i in rolling["manual"]}
+
+    def to_text(pending):
+        vtt = [c for c in pending if id(c) not in manual_ids]
+        manual = cues_to_text(c for c in pending if id(c) in manual_ids)
+        return build_source_text(vtt, manual, rolling.get("compact", True))[0]
+
+    res = summarize_incremental(rolling["meeting_key"], cues, api_key, to_text=to_text,
+                                use_cache=use_cache, render_stream=render_stream)
+    # Rapat bergulir: setiap unggahan menimpa entri arsip rapat yang sama
+    res["archive_id"] = archive_result(archive_key("rolling", rolling["meeting_key"]), KIND_NOTULEN, res, payload["transcript"])
+    return res
+
+
+def run_prompt(payload, api_key, render_stream):
+    stream = stream_with_fallback(payload["prompt"], api_key, use_cache=payload.get("use_cache", True))
+    render_stream(stream)
+    return stream.consume()
+
+
+def run_repair(payload, api_key, render_stream):
+    res = run_prompt(payload, api_key, render_stream)
+    source = payload.get("source", payload["prompt"])
+    res["archive_id"] = archive_result(archive_key(KIND_REPAIR, source), KIND_REPAIR, res, source)
+    return res
+
+
+JOB_HANDLERS = {"generate": run_generate, "repair": run_repair, "chat": run_prompt}
+
+
+class JobQueue:
+    def __init__(self, api_key=None, workers=JOB_WORKERS, store=None, handlers=None):
+        self.api_key = None
+        self.store = store or JobStore()
+        self.handlers = handlers or JOB_HANDLERS
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notulen-job")
+        self._lock = threading.Lock()
+        self._resumed = False
+        self.set_api_key(api_key)
+
+    def set_api_key(self, api_key):
+        # Job yang terputus karena proses sebelumnya berhenti dijalankan ulang dari awal,
+        # tetapi baru setelah ada API key: tanpa key semuanya langsung gagal permanen
+        if not api_key:
+            return
+        with self._lock:
+            self.api_key = api_key
+            if self._resumed:
+                return
+            self._resumed = True
+        for job_id in self.store.unfinished():
+            self._executor.submit(self._run, job_id)
+
+    def submit(self, kind, payload):
+        with self._lock:
+            job_id, created = self.store.create(kind, payload, job_key(kind, payload))
+        if created:
+            self._executor.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def _run(self, job_id):
+        job = self.store.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            return
+        self.store.start(job_id)
+        with track(f"job_{job['kind']}", wait=time.time() - job["created"]) as event:
+            try:
+                handler = self.handlers[job["kind"]]
+                res = handler(job["payload"], self.api_key, PartialWriter(self.store, job_id))
+            except Exception as e:
+                res = {"success": False, "error": f"Job gagal dijalankan. Error: {e}"}
+            track_result(event, res)
+        self.store.finish(job_id, res)
+
+
+_queue = ProcessSingleton(JobQueue)
+
+
+def get_job_queue(api_key=None):
+    # Tanpa API key antrean hanya bisa dibaca (status job); job terputus menunggu key
+    queue = _queue.get()
+    queue.set_api_key(api_key)
+    return queue
@@ -0,0 +1,119 @@
+from notulen.prompts import INCREMENT_DISKUSI_HEADER
+
+# ==============================================================================
+# PENGGABUNGAN BARIS NOTULEN BARU KE NOTULEN YANG SUDAH ADA
+# ==============================================================================
+# Jawaban prompt inkremental hanya berisi agenda, peserta, dan baris tabel diskusi
+# yang baru. Baris tersebut disisipkan ke blok yang sesuai secara lokal (tanpa LLM),
+# dipakai oleh notulen bergulir maupun reduce bertahap pada rapat yang sangat panjang.
+
+AGENDA_HEADER = "**Agenda:**"
+PESERTA_HEADER = "**Peserta Rapat:**"
+DISKUSI_HEADER = "**Poin Diskusi dan Arahan:**"
+DISCLAIMER_HEADER = "**Disclaimer:**"
+BULLET_PREFIXES = ("-", "•", "*")
+
+
+def _cells(row):
+    return [cell.strip() for cell in row.strip().strip("|").split("|")]
+
+
+def _is_separator(row):
+    return all(set(cell) <= set("-: ") for cell in _cells(row))
+
+
+def parse_increment(markdown):
+    # Ambil agenda, peserta, dan baris tabel diskusi baru dari jawaban model
+    sections = {"agenda": [], "peserta": [], "diskusi": []}
+    current, header_seen = None, False
+    for raw in markdown.splitlines():
+        line = raw.strip()
+        if (line.startswith("**") and line.endswith(":**")) or line.startswith("#"):
+            current = ("agenda" if "Agenda" in line else "peserta" if "Peserta" in line
+                       else "diskusi" if "Diskusi" in line else None)
+            header_seen = False
+            continue
+        if current is None or not line:
+            continue
+        if current == "agenda" and _is_bullet(line):
+            item = line.lstrip("-•* ").strip()
+            if item and not item.startswith("["):
+                sections["agenda"].append(item)
+        elif line.startswith("|"):
+            if not header_seen:
+                header_seen = True  # baris judul kolom
+                continue
+            if _is_separator(line):
+                continue
+            if current == "peserta":
+                name = _cells(line)[-1]
+                if name and not name.startswith("["):
+                    sections["peserta"].append(name)
+            elif current == "diskusi" and not _cells(line)[0].lstrip("*").startswith("["):
+                sections["diskusi"].append(line)
+    return sections
+
+
+def _is_bullet(line):
+    # "**Judul:**" diawali "*" tetapi bukan butir daftar
+    line = line.strip()
+    return line.startswith(BULLET_PREFIXES) and not line.startswith("**")
+
+
+def _is_row(line):
+    return line.strip().startswith("|")
+
+
+def _find(lines, header):
+    return next((i for i, line in enumerate(lines) if line.strip().startswith(header)), None)
+
+
+def _block_end(lines, start, is_item):
+    # Indeks setelah baris terakhir blok (tabel atau daftar) yang barisnya lolos is_item setelah header
+    i = start + 1
+    while i < len(lines) and not lines[i].strip():
+        i += 1
+    end = start + 1
+    while i < len(lines) and is_item(lines[i]):
+        i += 1
+        end = i
+    return end
+
+
+def merge_notulen(notulen, increment):
+    sections = parse_increment(increment)
+    lines = notulen.splitlines()
+
+    if sections["agenda"]:
+        at = _find(lines, AGENDA_HEADER)
+        if at is not None:
+            end = _block_end(lines, at, _is_bullet)
+            items = [line.strip() for line in lines[at + 1:end] if _is_bullet(line)]
+            existing = {item.lstrip("-•* ").lower() for item in items}
+            # Ikuti gaya butir yang sudah dipakai notulen
+            marker = items[-1][0] if items else "-"
+            lines[end:end] = [f"{marker} {item}" for item in sections["agenda"] if item.lower() not in existing]
+
+    if sections["peserta"]:
+        at = _find(lines, PESERTA_HEADER)
+        if at is not None:
+            end = _block_end(lines, at, _is_row)
+            rows = [line for line in lines[at + 1:end] if line.strip().startswith("|")][2:]
+            existing = {_cells(row)[-1].lower() for row in rows}
+            added = [name for name in sections["peserta"] if name.lower() not in existing]
+            lines[end:end] = [f"| {len(rows) + i} | {name} |" for i, name in enumerate(added, 1)]
+
+    if sections["diskusi"]:
+        at = _find(lines, DISKUSI_HEADER)
+        if at is not None:
+            end = _block_end(lines, at, _is_row)
+            lines[end:end] = sections["diskusi"]
+        else:
+            # Notulen tidak berformat baku: tambahkan tabel lanjutan sebelum disclaimer
+            at = _find(lines, DISCLAIMER_HEADER)
+            at = len(lines) if at is None else at
+            block = ["", INCREMENT_DISKUSI_HEADER, "| Pembahasan / Topik | Penanggung Jawab |", "|---|---|",
+                     *sections["diskusi"], ""]
+            lines[at:at] = block
+
+    return "\n".join(lines)
@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+from notulen.prompts import CHARS_PER_TOKEN
+from notulen.storage import DATA_DIR, ProcessSingleton
+
+# ==============================================================================
+# INSTRUMENTASI PER TAHAP (DURASI, UKURAN, TOKEN, ATTEMPT MODEL, CACHE)
+# ==============================================================================
+# Setiap tahap (parsing VTT, pemanggilan LLM, ekspor DOCX/PDF) menghasilkan satu
+# event yang ditulis sebagai baris JSON ke metrics.jsonl dan diagregasi menjadi
+# berkas teks format Prometheus (metrics.prom, cocok untuk textfile collector).
+# Durasi terbaru per tahap disimpan di memori untuk panel admin (persentil).
+
+METRICS_LOG_PATH = os.path.join(DATA_DIR, "metrics.jsonl")
+METRICS_PROM_PATH = os.path.join(DATA_DIR, "metrics.prom")
+METRICS_LOG_MAX_BYTES = 5 * 1024 * 1024
+PROM_WRITE_INTERVAL = 5.0
+RECENT_PER_STAGE = 500
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+# Set NOTULEN_METRICS=0 agar event hanya disimpan di memori (tanpa menulis berkas)
+METRICS_ENABLED = os.environ.get("NOTULEN_METRICS", "1") != "0"
+
+
+def _tokens(size):
+    return (size + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _quantile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class MetricsRecorder:
+    def __init__(self, log_path=METRICS_LOG_PATH, prom_path=METRICS_PROM_PATH, enabled=METRICS_ENABLED):
+        self.log_path = log_path
+        self.prom_path = prom_path
+        self.enabled = enabled
+        self._durations = defaultdict(lambda: deque(maxlen=RECENT_PER_STAGE))
+        self._events = deque(maxlen=RECENT_PER_STAGE)
+        self._counters = defaultdict(float)  # (nama metrik, label) -> nilai
+        self._lock = threading.Lock()
+        self._prom_written = 0.0
+
+    def record(self, stage, event):
+        event = {"ts": round(time.time(), 3), "stage": stage, **event}
+        for field in ("duration", "wait", "ttft"):
+            if isinstance(event.get(field), float):
+                event[field] = round(event[field], 6)
+        for direction in ("in", "out"):
+            # Ukuran teks (karakter) dikonversi ke perkiraan token; ekspor biner memakai bytes_out
+            if event.get(f"chars_{direction}") is not None:
+                event[f"tokens_{direction}"] = _tokens(event[f"chars_{direction}"])
+
+        status = event.get("status", "ok")
+        with self._lock:
+            self._events.append(event)
+            self._durations[stage].append(event["duration"])
+            self._counters[("notulen_stage_total", _labels(stage=stage, status=status))] += 1
+            self._counters[("notulen_stage_duration_seconds_total", _labels(stage=stage))] += event["duration"]
+            for field, metric in (("chars_in", "notulen_stage_input_chars_total"),
+                                  ("chars_out", "notulen_stage_output_chars_total"),
+                                  ("bytes_out", "notulen_stage_output_bytes_total"),
+                                  ("attempts", "notulen_llm_attempts_total"),
+                                  ("wait", "notulen_llm_wait_seconds_total")):
+                if event.get(field):
+                    self._counters[(metric, _labels(stage=stage))] += event[field]
+            for direction in ("in", "out"):
+                if event.get(f"tokens_{direction}") and "attempts" in event:
+                    self._counters[("notulen_llm_tokens_total", _labels(stage=stage, direction=direction))] += event[f"tokens_{direction}"]
+            if event.get("cached"):
+                self._counters[("notulen_llm_cache_hits_total", _labels(stage=stage))] += 1
+            if event.get("model") and status == "ok":
+                self._counters[("notulen_llm_answers_total", _labels(model=event["model"]))] += 1
+
+        if self.enabled:
+            self._append_log(event)
+            if time.monotonic() - self._prom_written >= PROM_WRITE_INTERVAL:
+                self.write_prometheus()
+
+    def _append_log(self, event):
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > METRICS_LOG_MAX_BYTES:
+                os.replace(self.log_path, self.log_path + ".1")
+            # Mode append: aman ditulis bersamaan oleh proses worker batch
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            pass
+
+    def percentiles(self, quantiles=SUMMARY_QUANTILES):
+        with self._lock:
+            snapshot = {stage: sorted(values) for stage, values in self._durations.items() if values}
+        return {
+            stage: {"count": len(values), **{f"p{round(q * 100)}": _quantile(values, q) for q in quantiles}}
+            for stage, values in snapshot.items()
+        }
+
+    def recent(self, limit=20):
+        with self._lock:
+            return list(self._events)[-limit:][::-1]
+
+    def prometheus_text(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+        lines = []
+        seen = set()
+        for (metric, labels), value in counters:
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{labels} {value:.6g}")
+        lines.append("# TYPE notulen_stage_duration_seconds gauge")
+        for stage, summary in sorted(self.percentiles().items()):
+            for q in SUMMARY_QUANTILES:
+                lines.append(f"notulen_stage_duration_seconds{_labels(stage=stage, quantile=q)} {summary[f'p{round(q * 100)}']:.6g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self):
+        import multiprocessing
+
+        # Hanya proses utama yang menulis agregat; worker process pool cukup ke log JSON
+        if multiprocessing.parent_process() is not None:
+            return
+        self._prom_written = time.monotonic()
+        tmp = self.prom_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.prom_path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp, self.prom_path)
+        except OSError:
+            pass
+
+
+def _create_metrics():
+    import atexit
+
+    metrics = MetricsRecorder()
+    if metrics.enabled:
+        atexit.register(metrics.write_prometheus)
+    return metrics
+
+
+_metrics = ProcessSingleton(_create_metrics)
+
+
+def get_metrics():
+    return _metrics.get()
+
+
+@contextmanager
+def track(stage, **fields):
+    # Field event bisa ditambah di dalam blok: with track("x") as event: event["model"] = ...
+    event = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield event
+    except Exception as e:
+        event["status"] = "error"
+        event["error"] = type(e).__name__
+        raise
+    finally:
+        event["duration"] = time.perf_counter() - start
+        get_metrics().record(stage, event)
+
+
+def track_result(event, res):
+    # Salin ringkasan dict hasil LLM ({"success", "content", "model", ...}) ke event
+    event["status"] = "ok" if res.get("success") else ("max_tokens" if res.get("max_tokens") else "error")
+    event["cached"] = bool(res.get("cached"))
+    if res.get("model"):
+        event["model"] = res["model"]
+    if res.get("content"):
+        event["chars_out"] = len(res["content"])
+    return res
+
+
+def timed(stage, chars_in=None, chars_out=None, bytes_out=None):
+    # Dekorator untuk tahap sinkron sederhana; argumen berupa fungsi pengukur ukuran
+    def decorator(func):
+        @wraps(func)
+        def wrapper(source, *args, **kwargs):
+            with track(stage) as event:
+                if chars_in is not None:
+                    event["chars_in"] = chars_in(source)
+                result = func(source, *args, **kwargs)
+                if chars_out is not None:
+                    event["chars_out"] = chars_out(result)
+                if bytes_out is not None:
+                    event["bytes_out"] = bytes_out(result)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,194 @@
+# ==============================================================================
+# PROMPT TEMPLATES
+# ==============================================================================
+
+# Perkiraan kasar tokenizer Gemini untuk teks Indonesia (~4 karakter per token)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+NOTULEN_FORMAT = """FORMAT YANG DIHARAPKAN (Gunakan format Tabel Markdown persis seperti ini):
+
+# Notulen Rapat
+
+| Judul | Keterangan |
+|---|---|
+| Nama Rapat | [Ekstrak/Isi nama rapat] |
+| Hari/Tanggal | [Ekstrak hari, tanggal] |
+| Waktu | [Ekstrak waktu rapat] |
+| Tempat | [Ekstrak lokasi/metode rapat] |
+| Pemimpin Rapat | [Ekstrak jabatan pemimpin rapat] |
+| Dibuat oleh | Group Monitoring Evaluasi Strategi Perusahaan dan Inovasi |
+
+**Agenda:**
+- [Daftar agenda rapat secara lengkap]
+
+**Peserta Rapat:**
+| No | Nama/Jabatan |
+|---|---|
+| 1 | [Nama peserta 1 / Jabatan] |
+
+**Poin Diskusi dan Arahan:**
+| Pembahasan / Topik | Penanggung Jawab |
+|---|---|
+| **[Topik Pembahasan 1 di sini]** | |
+| **Poin Diskusi:** | |
+| [Jabatan/Nama] menyampaikan:<br>• [Poin penyampaian 1 yang deskriptif, menjaga konteks teknis/strategis, dan menggunakan bahasa korporat formal]<br>• [Poin penyampaian 2 yang utuh dan tidak menghilangkan makna asli] | |
+| [Jabatan/Nama lain] menyampaikan/menyoroti:<br>• [Poin elaborasi yang komprehensif] | |
+| **Kesimpulan :** | |
+| [Jabatan/Nama] memberikan arahan sebagai berikut:<br>• [Poin kesimpulan yang jelas, tegas, dan dapat ditindaklanjuti] | [Jabatan Penanggung Jawab] |
+
+**Disclaimer:**
+_Jika tidak ada tanggapan dalam tiga hari sejak dokumen ini didistribusikan, maka dokumen ini dianggap final._"""
+
+NOTULEN_INSTRUCTIONS = """INSTRUKSI KHUSUS DAN KETAT:
+1. Identifikasi Pembicara: Wajib mengekstrak siapa yang berbicara. Gunakan Jabatan (jika disebutkan/diketahui) atau nama peserta.
+2. Kedalaman Makna (SANGAT PENTING): JANGAN meringkas poin diskusi terlalu ekstrem. Pertahankan substansi, detail teknis, metrik/angka, dan konteks strategis dari pembicaraan asli. Setiap bullet point (•) harus berupa kalimat atau frasa yang utuh.
+3. Gaya Bahasa Profesional: Ubah bahasa lisan, slang, atau catatan kasar menjadi bahasa dokumen korporat tingkat tinggi. Gunakan kata kerja aktif/pasif yang formal (misal: "menyoroti pentingnya...", "mengusulkan skema...", "menjabarkan kendala...", "menginstruksikan agar...").
+4. Struktur Diskusi & Kesimpulan: Patuhi hierarki tabel: Topik -> "Poin Diskusi:" -> Siapa menyampaikan apa -> "Kesimpulan :" -> Arahan dan Penanggung Jawab di kolom kanan.
+5. Penggabungan Konteks: Gabungkan konteks dari berbagai sumber agar kronologi nyambung secara logis tanpa duplikasi informasi."""
+
+
+def build_notulen_prompt(transcript):
+    return f"""**INI ADALAH DATA RAPAT FORMAL PERUSAHAAN PELINDO. BUATKAN NOTULEN RAPAT DENGAN BAHASA INDONESIA YANG SANGAT FORMAL, BAKU, DAN PROFESIONAL. HANYA FOKUS PADA AGENDA, DISKUSI, DAN KEPUTUSAN SAJA.**
+
+Anda akan menerima data transkrip/catatan rapat yang merupakan GABUNGAN dari beberapa sumber (contoh: gabungan file transkrip otomatis VTT Zoom dan catatan teks manual). Analisis dan sintesis seluruh teks gabungan tersebut sebagai satu kesatuan alur rapat yang utuh.
+
+Buatkan notulen rapat yang rapi dan komprehensif dari data rapat berikut:
+
+{transcript}
+
+{NOTULEN_FORMAT}
+
+{NOTULEN_INSTRUCTIONS}"""
+
+
+def build_segment_prompt(segment, index, total):
+    return f"""Anda adalah notulis rapat formal perusahaan Pelindo. Berikut adalah SEGMEN {index} DARI {total} transkrip rapat (potongan berurutan dari satu rapat yang sama).
+
+SEGMEN TRANSKRIP:
+\"\"\"
+{segment}
+\"\"\"
+
+Buat catatan ringkas namun LENGKAP dari segmen ini dalam bahasa Indonesia formal, berupa daftar poin (bukan tabel):
+- Informasi pembukaan bila ada (nama rapat, hari/tanggal, waktu, tempat, pemimpin rapat, peserta).
+- Setiap topik yang dibahas beserta siapa (Jabatan/Nama) menyampaikan apa. Pertahankan detail teknis, metrik/angka, dan konteks strategis.
+- Kesimpulan, arahan, dan penanggung jawab yang disebutkan.
+Jangan menambahkan informasi yang tidak ada di segmen."""
+
+
+def build_reduce_prompt(segment_notes):
+    joined = "\n\n".join(f"CATATAN SEGMEN {i}:\n{note}" for i, note in enumerate(segment_notes, 1))
+    return f"""**INI ADALAH DATA RAPAT FORMAL PERUSAHAAN PELINDO. BUATKAN NOTULEN RAPAT DENGAN BAHASA INDONESIA YANG SANGAT FORMAL, BAKU, DAN PROFESIONAL. HANYA FOKUS PADA AGENDA, DISKUSI, DAN KEPUTUSAN SAJA.**
+
+Anda akan menerima catatan berurutan yang masing-masing merangkum satu segmen dari rapat yang sama. Sintesis seluruh catatan tersebut menjadi satu notulen yang utuh: gabungkan topik yang berulang antar segmen dan jaga kronologi rapat.
+
+{joined}
+
+{NOTULEN_FORMAT}
+
+{NOTULEN_INSTRUCTIONS}"""
+
+
+INCREMENT_AGENDA_HEADER = "**Agenda Tambahan:**"
+INCREMENT_PESERTA_HEADER = "**Peserta Tambahan:**"
+INCREMENT_DISKUSI_HEADER = "**Poin Diskusi dan Arahan (Lanjutan):**"
+
+INCREMENT_FORMAT = f"""FORMAT JAWABAN (HANYA bagian baru, jangan ulangi isi notulen yang sudah ada):
+
+{INCREMENT_AGENDA_HEADER}
+- [Agenda baru yang belum tercantum; kosongkan bila tidak ada]
+
+{INCREMENT_PESERTA_HEADER}
+| No | Nama/Jabatan |
+|---|---|
+| 1 | [Peserta baru yang belum tercantum; kosongkan tabel bila tidak ada] |
+
+{INCREMENT_DISKUSI_HEADER}
+| Pembahasan / Topik | Penanggung Jawab |
+|---|---|
+| **[Topik Pembahasan]** | |
+| **Poin Diskusi:** | |
+| [Jabatan/Nama] menyampaikan:<br>• [Poin penyampaian] | |
+| **Kesimpulan :** | |
+| [Jabatan/Nama] memberikan arahan sebagai berikut:<br>• [Poin kesimpulan] | [Jabatan Penanggung Jawab] |"""
+
+
+def build_incremental_prompt(current_notulen, segment):
+    return f"""**INI ADALAH DATA RAPAT FORMAL PERUSAHAAN PELINDO YANG MASIH BERLANGSUNG. GUNAKAN BAHASA INDONESIA YANG SANGAT FORMAL, BAKU, DAN PROFESIONAL.**
+
+Berikut notulen rapat yang sudah disusun dari bagian awal rapat:
+
+{current_notulen}
+
+Berikut LANJUTAN transkrip rapat yang belum tercakup dalam notulen di atas:
+
+{segment}
+
+Susun HANYA baris notulen baru dari lanjutan transkrip tersebut. Baris baru akan ditambahkan di akhir tabel "Poin Diskusi dan Arahan". Bila lanjutan membahas topik yang sudah ada, tulis ulang judul topiknya lalu tambahkan poin dan kesimpulan barunya saja.
+
+{INCREMENT_FORMAT}
+
+{NOTULEN_INSTRUCTIONS}"""
+
+
+CHAT_TURN_CHARS = 1500
+
+
+def build_chat_prompt(question, transcript=None, passages=None, history=()):
+    # Transkrip pendek dikirim utuh; transkrip panjang hanya potongan hasil retrieval
+    if passages is not None:
+        reference = "POTONGAN TRANSKRIP PALING RELEVAN:\n" + "\n\n".join(f"[{p.label}]\n{p.text}" for p in passages)
+        citation = " Sertakan rujukan waktu dalam format [jj:mm:dd] dari potongan yang dipakai."
+    else:
+        reference = f"TRANSKRIP REFERENSI:\n{transcript}"
+        citation = ""
+    turns = "\n".join(f"{'PENGGUNA' if m['role'] == 'user' else 'ASISTEN'}: {m['content'][:CHAT_TURN_CHARS]}" for m in history)
+    conversation = f"RIWAYAT PERCAKAPAN TERAKHIR:\n{turns}\n\n" if turns else ""
+    return f"{reference}\n\n{conversation}PERTANYAAN: {question}\n\nINSTRUKSI: Jawablah hanya berdasarkan transkrip di atas dengan bahasa Indonesia formal.{citation}"
+
+
+def build_repair_prompt(raw_notes):
+    return f"""Anda adalah asisten AI profesional untuk Pelindo. Tugas Anda adalah mereparasi draf rapat yang acak-acakan menjadi bahasa Indonesia yang sangat formal, baku, dan kaya akan konteks profesional.
+
+        DRAF KASAR:
+        \"\"\"
+        {raw_notes}
+        \"\"\"
+
+        FORMAT WAJIB YANG HARUS DIGUNAKAN (Gunakan Tabel Markdown):
+        # Notulen Rapat
+        | Judul | Keterangan |
+        |---|---|
+        | Nama Rapat | [Ekstrak/Buat nama rapat] |
+        | Hari/Tanggal | [Ekstrak tanggal] |
+        | Waktu | [Ekstrak waktu] |
+        | Tempat | [Ekstrak tempat] |
+        | Pemimpin Rapat | [Ekstrak pemimpin] |
+        | Dibuat oleh | Group Monitoring Evaluasi Strategi Perusahaan dan Inovasi |
+
+        **Agenda:**\n- [Daftar agenda]
+
+        **Peserta Rapat:**
+        | No | Nama/Jabatan |
+        |---|---|
+        | 1 | [Ekstrak nama] |
+
+        **Poin Diskusi dan Arahan:**
+        | Pembahasan / Topik | Penanggung Jawab |
+        |---|---|
+        | **[Topik Pembahasan]** | |
+        | **Poin Diskusi:** | |
+        | [Jabatan/Nama] menyampaikan:<br>• [Poin penyampaian yang telah dielevasi menjadi bahasa formal tanpa mengurangi makna asli] | |
+        | **Kesimpulan :** | |
+        | [Jabatan/Nama] memberikan arahan sebagai berikut:<br>• [Poin arahan yang tegas] | [Penanggung Jawab] |
+
+        **Disclaimer:**\n_Jika tidak ada tanggapan dalam tiga hari sejak dokumen ini didistribusikan, maka dokumen ini dianggap final._
+        
+        INSTRUKSI REPARASI:
+        1. Jangan menghilangkan substansi atau mengecilkan makna dari draf asli. Perbaiki tata bahasanya saja menjadi kalimat korporat yang elegan.
+        2. Jika ada kalimat yang terpotong di draf, buat agar terdengar masuk akal dan formal secara bisnis."""
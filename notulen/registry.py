@@ -0,0 +1,184 @@
+import random
+import re
+import threading
+import time
+from collections import deque
+
+# ==============================================================================
+# REGISTRY MODEL: HANDLE CACHE, HEALTH TRACKING & CIRCUIT BREAKER
+# ==============================================================================
+# Satu registry per proses, dibagi semua sesi yang memakai API key yang sama.
+# - Model yang membalas 404 diistirahatkan selama NOT_FOUND_COOLDOWN.
+# - Error kuota (429) menandai model "rate limited" sesuai hint retry-after,
+#   atau backoff eksponensial dengan jitter bila tidak ada hint.
+# - Kegagalan beruntun membuka circuit breaker selama BREAKER_COOLDOWN.
+# - Kandidat diurutkan: model sehat tercepat dulu, lalu yang belum pernah dicoba
+#   (urutan FALLBACK_MODELS), lalu yang tingkat error-nya tinggi.
+
+NOT_FOUND_COOLDOWN = 30 * 60
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 60
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+MAX_QUOTA_WAIT = 20.0
+STATS_WINDOW = 20
+UNHEALTHY_ERROR_RATE = 0.5
+
+RETRY_AFTER_RE = re.compile(r"retry (?:in|after) ([\d.]+)\s*s|retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE)
+
+
+def classify_error(message):
+    err = message.lower()
+    if '429' in err or 'quota' in err or 'exhausted' in err:
+        return "quota"
+    if '404' in err or 'not found' in err:
+        return "not_found"
+    if 'max_tokens' in err:
+        return "max_tokens"
+    return "error"
+
+
+def parse_retry_after(message):
+    m = RETRY_AFTER_RE.search(message)
+    if not m:
+        return None
+    return float(m.group(1) or m.group(2))
+
+
+class ModelStats:
+    __slots__ = ("latencies", "outcomes", "consecutive_failures", "quota_strikes", "unavailable_until", "reason")
+
+    def __init__(self):
+        self.latencies = deque(maxlen=STATS_WINDOW)
+        self.outcomes = deque(maxlen=STATS_WINDOW)
+        self.consecutive_failures = 0
+        self.quota_strikes = 0
+        self.unavailable_until = 0.0
+        self.reason = ""
+
+    @property
+    def error_rate(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    @property
+    def mean_latency(self):
+        return sum(self.latencies) / len(self.latencies) if self.latencies else None
+
+
+class ModelRegistry:
+    def __init__(self, model_names):
+        self.model_names = list(model_names)
+        self._stats = {name: ModelStats() for name in self.model_names}
+        self._handles = {}
+        self._api_key = None
+        self._lock = threading.Lock()
+
+    def get_model(self, model_name, api_key):
+        # Import SDK Gemini (~0.8 dtk) ditunda sampai model pertama kali dibutuhkan
+        import google.generativeai as genai
+
+        with self._lock:
+            if api_key != self._api_key:
+                genai.configure(api_key=api_key)
+                self._api_key = api_key
+                self._handles.clear()
+            handle = self._handles.get(model_name)
+            if handle is None:
+                handle = self._handles[model_name] = genai.GenerativeModel(model_name)
+            return handle
+
+    def candidates(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            ranked = []
+            for index, name in enumerate(self.model_names):
+                stats = self._stats[name]
+                if stats.unavailable_until > now:
+                    continue
+                if stats.error_rate >= UNHEALTHY_ERROR_RATE:
+                    rank = (2, stats.mean_latency or 0.0, index)
+                elif stats.mean_latency is None:
+                    rank = (1, 0.0, index)
+                else:
+                    rank = (0, stats.mean_latency, index)
+                ranked.append((rank, name))
+            return [name for _, name in sorted(ranked)]
+
+    def latency_quantile(self, model_name, q=0.95, min_samples=5):
+        with self._lock:
+            samples = sorted(self._stats[model_name].latencies)
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def next_rate_limited(self, now=None):
+        # Model terkena kuota yang paling cepat pulih: (detik tunggu, nama) atau None
+        now = time.time() if now is None else now
+        with self._lock:
+            limited = [
+                (stats.unavailable_until - now, name)
+                for name, stats in self._stats.items()
+                if stats.reason == "quota" and stats.unavailable_until > now
+            ]
+        return min(limited) if limited else None
+
+    def record_success(self, model_name, latency):
+        with self._lock:
+            stats = self._stats[model_name]
+            stats.latencies.append(latency)
+            stats.outcomes.append(True)
+            stats.consecutive_failures = 0
+            stats.quota_strikes = 0
+            stats.unavailable_until = 0.0
+            stats.reason = ""
+
+    def record_failure(self, model_name, message, now=None):
+        now = time.time() if now is None else now
+        kind = classify_error(message)
+        with self._lock:
+            stats = self._stats[model_name]
+            stats.outcomes.append(False)
+            stats.consecutive_failures += 1
+            if kind == "not_found":
+                stats.unavailable_until = now + NOT_FOUND_COOLDOWN
+                stats.reason = kind
+            elif kind == "quota":
+                stats.quota_strikes += 1
+                retry_after = parse_retry_after(message)
+                if retry_after is not None:
+                    delay = retry_after * random.uniform(1.0, 1.2)
+                else:
+                    delay = random.uniform(0.5, 1.0) * min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (stats.quota_strikes - 1))
+                stats.unavailable_until = now + delay
+                stats.reason = kind
+            elif stats.consecutive_failures >= BREAKER_THRESHOLD:
+                stats.unavailable_until = now + BREAKER_COOLDOWN
+                stats.reason = "breaker"
+        return kind
+
+    def snapshot(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            return [
+                {
+                    "model": name,
+                    "mean_latency": stats.mean_latency,
+                    "error_rate": stats.error_rate,
+                    "calls": len(stats.outcomes),
+                    "available_in": max(0.0, stats.unavailable_until - now),
+                    "reason": stats.reason if stats.unavailable_until > now else "",
+                }
+                for name, stats in self._stats.items()
+            ]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry(model_names):
+    global _registry
+    with _registry_lock:
+        if _registry is None or _registry.model_names != list(model_names):
+            _registry = ModelRegistry(model_names)
+        return _registry
@@ -0,0 +1,102 @@
+import re
+from collections import Counter
+
+from notulen.vtt import format_timestamp
+
+# ==============================================================================
+# INDEKS RETRIEVAL TRANSKRIP (BM25) UNTUK TANYA JAWAB
+# ==============================================================================
+# Transkrip dipecah menjadi jendela cue yang saling tumpang tindih; setiap
+# pertanyaan hanya mengirim top-k jendela paling relevan, bukan seluruh transkrip.
+# Postings disimpan sebagai array NumPy per term sehingga skor dihitung tervektorisasi
+# (NumPy baru di-import saat indeks pertama kali dibangun).
+
+WINDOW_CUES = 8
+WINDOW_STRIDE = 4
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    "yang dan di ke dari ini itu untuk dengan pada adalah akan juga kita kami saya anda ada atau "
+    "tidak sudah bisa dalam oleh karena jadi ya eh ehm nah oke apa siapa bagaimana kapan mengapa "
+    "tersebut sebagai agar bahwa seperti".split()
+)
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+class Passage:
+    __slots__ = ("start", "end", "text")
+
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+
+    @property
+    def label(self):
+        if self.start is None:
+            return "Catatan"
+        return f"{format_timestamp(self.start)}–{format_timestamp(self.end)}"
+
+
+def build_passages(cues, window=WINDOW_CUES, stride=WINDOW_STRIDE):
+    passages = []
+    for i in range(0, max(len(cues) - window + stride, 1), stride):
+        chunk = cues[i:i + window]
+        if not chunk:
+            break
+        timed = [c for c in chunk if c.start is not None]
+        start = timed[0].start if timed else None
+        end = max(c.end for c in timed) if timed else None
+        passages.append(Passage(start, end, "\n".join(c.to_line() for c in chunk if c.text)))
+    return passages
+
+
+class TranscriptIndex:
+    def __init__(self, passages):
+        import numpy as np
+
+        self.passages = passages
+        doc_lengths = np.zeros(len(passages), dtype=np.float32)
+        postings = {}
+        for doc_id, passage in enumerate(passages):
+            counts = Counter(tokenize(passage.text))
+            doc_lengths[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                postings.setdefault(term, ([], []))
+                postings[term][0].append(doc_id)
+                postings[term][1].append(tf)
+
+        n_docs = max(len(passages), 1)
+        avg_len = float(doc_lengths.mean()) if len(passages) else 1.0
+        self._norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / max(avg_len, 1.0))
+        self._postings = {}
+        for term, (doc_ids, tfs) in postings.items():
+            idf = np.log(1 + (n_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            self._postings[term] = (np.asarray(doc_ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32), idf)
+
+    @classmethod
+    def from_cues(cls, cues):
+        return cls(build_passages(cues))
+
+    def search(self, query, k=6):
+        import numpy as np
+
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        for term in set(tokenize(query)):
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            doc_ids, tfs, idf = entry
+            scores[doc_ids] += idf * tfs * (BM25_K1 + 1) / (tfs + self._norm[doc_ids])
+
+        hits = np.flatnonzero(scores)
+        if not len(hits):
+            return []
+        top = hits[np.argsort(-scores[hits], kind="stable")[:k]]
+        # Kembalikan dalam urutan kronologis agar konteks mudah dibaca model
+        return [self.passages[i] for i in sorted(top)]
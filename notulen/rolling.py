@@ -0,0 +1,139 @@
+import hashlib
+import os
+import time
+
+from notulen.engine import generate_with_fallback
+from notulen.merge import merge_notulen
+from notulen.prompts import build_incremental_prompt, estimate_tokens
+from notulen.storage import DATA_DIR, ProcessSingleton, SQLiteStore
+from notulen.summarize import MAP_WORKERS, SINGLE_PASS_MAX_TOKENS, final_step, summarize_transcript
+from notulen.vtt import cues_to_text
+
+# ==============================================================================
+# NOTULEN BERGULIR (INKREMENTAL) UNTUK RAPAT YANG MASIH BERLANGSUNG
+# ==============================================================================
+# Ekspor VTT parsial dari rapat yang sama memiliki awal yang identik, sehingga
+# rapat dikenali dari hash beberapa cue pertama. Cue yang sudah dirangkum dicatat
+# per hash; unggahan berikutnya hanya mengirim cue baru + notulen terkini, lalu
+# baris hasilnya digabung ke tabel notulen. Status disimpan di SQLite sehingga
+# refresh halaman tidak mengulang rapat dari awal.
+
+ROLLING_PATH = os.path.join(DATA_DIR, "rolling.sqlite3")
+MEETING_KEY_CUES = 5
+# Cue terakhir ekspor sebelumnya bisa masih bertambah teksnya (caption bergulir):
+# cue berubah dalam rentang ini dari cue terakhir yang dirangkum ikut dikirim ulang
+REWIND_SECONDS = 30.0
+
+
+def cue_hash(cue):
+    start = "" if cue.start is None else f"{cue.start:.3f}"
+    return hashlib.sha256(f"{start}|{cue.speaker or ''}|{cue.text}".encode("utf-8")).hexdigest()[:32]
+
+
+def meeting_key(cues):
+    # Awal transkrip sama pada setiap ekspor parsial rapat yang sama
+    head = [cue_hash(cue) for cue in cues[:MEETING_KEY_CUES]]
+    return hashlib.sha256("|".join(head).encode("ascii")).hexdigest()[:32] if head else None
+
+
+class RollingStore(SQLiteStore):
+    def __init__(self, path=ROLLING_PATH):
+        super().__init__(path)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meetings ("
+                "key TEXT PRIMARY KEY, notulen TEXT NOT NULL, watermark REAL, "
+                "cues INTEGER NOT NULL, updates INTEGER NOT NULL, created REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meeting_cues ("
+                "key TEXT NOT NULL, hash TEXT NOT NULL, PRIMARY KEY (key, hash))"
+            )
+
+    def load(self, key):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT notulen, watermark, cues, updates, updated FROM meetings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            hashes = {h for (h,) in conn.execute("SELECT hash FROM meeting_cues WHERE key = ?", (key,))}
+        notulen, watermark, cues, updates, updated = row
+        return {"key": key, "notulen": notulen, "watermark": watermark, "cues": cues,
+                "updates": updates, "updated": updated, "hashes": hashes}
+
+    def save(self, key, notulen, cues):
+        now = time.time()
+        timed = [cue.start for cue in cues if cue.start is not None]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO meeting_cues (key, hash) VALUES (?, ?)",
+                             [(key, cue_hash(cue)) for cue in cues])
+            count = conn.execute("SELECT COUNT(*) FROM meeting_cues WHERE key = ?", (key,)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO meetings (key, notulen, watermark, cues, updates, created, updated) VALUES (?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET notulen = excluded.notulen, cues = excluded.cues, "
+                "watermark = MAX(COALESCE(watermark, excluded.watermark), COALESCE(excluded.watermark, watermark)), "
+                "updates = updates + 1, updated = excluded.updated",
+                (key, notulen, max(timed) if timed else None, count, now, now),
+            )
+
+    def reset(self, key):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM meeting_cues WHERE key = ?", (key,))
+            conn.execute("DELETE FROM meetings WHERE key = ?", (key,))
+
+
+_store = ProcessSingleton(RollingStore)
+
+
+def get_rolling_store():
+    return _store.get()
+
+
+def new_cues(cues, state):
+    # Cue yang belum pernah dirangkum; cue bertimestamp jauh sebelum watermark diabaikan
+    # walau hash-nya berbeda (mis. teks cue lama terpotong berbeda di ekspor baru)
+    if state is None:
+        return list(cues)
+    floor = state["watermark"] - REWIND_SECONDS if state["watermark"] is not None else None
+    return [
+        cue for cue in cues
+        if cue_hash(cue) not in state["hashes"] and (cue.start is None or floor is None or cue.start >= floor)
+    ]
+
+
+def summarize_incremental(key, cues, api_key, to_text=cues_to_text, generate=generate_with_fallback,
+                          use_cache=True, render_stream=None, max_workers=MAP_WORKERS, store=None):
+    # to_text(cues) menyusun teks transkrip untuk prompt (mis. label sumber + kompaksi)
+    store = store or get_rolling_store()
+    state = store.load(key)
+    pending = new_cues(cues, state)
+
+    if state is None:
+        res = summarize_transcript(to_text(pending), api_key, max_workers=max_workers, generate=generate,
+                                   use_cache=use_cache, render_stream=render_stream)
+        if res["success"]:
+            store.save(key, res["content"], pending)
+        res.update(incremental=True, new_cues=len(pending), known_cues=0)
+        return res
+
+    known = len(cues) - len(pending)
+    if not pending:
+        return {"success": True, "content": state["notulen"], "model": None, "cached": True,
+                "incremental": True, "new_cues": 0, "known_cues": known}
+
+    segment = to_text(pending)
+    if estimate_tokens(segment) > SINGLE_PASS_MAX_TOKENS:
+        # Lanjutan sangat panjang: ringkas dulu lewat map-reduce menjadi notulen segmen
+        partial = summarize_transcript(segment, api_key, max_workers=max_workers, generate=generate, use_cache=use_cache)
+        if not partial["success"]:
+            return partial
+        segment = partial["content"]
+
+    res = final_step(build_incremental_prompt(state["notulen"], segment), api_key, generate, use_cache, render_stream)
+    if not res["success"]:
+        return res
+    merged = merge_notulen(state["notulen"], res["content"])
+    store.save(key, merged, pending)
+    res.update(content=merged, incremental=True, new_cues=len(pending), known_cues=known)
+    return res
@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from notulen.backends import mock_backend_enabled
+
+# ==============================================================================
+# PENYIMPANAN LOKAL BERSAMA (DIREKTORI DATA, SQLITE, SINGLETON PER PROSES)
+# ==============================================================================
+# Dipakai cache respons, arsip rapat, antrean job, notulen bergulir, dan metrik.
+
+DATA_DIR = os.environ.get("NOTULEN_DATA_DIR", ".notulen_data")
+if mock_backend_enabled():
+    # Cache, arsip, job, dan status rapat dari backend mock tidak bercampur dengan data asli
+    DATA_DIR = os.path.join(DATA_DIR, "mock")
+
+SQLITE_TIMEOUT = 10
+
+
+class SQLiteStore:
+    # Store satu berkas SQLite: setiap operasi membuka koneksi sendiri (aman dipakai
+    # lintas thread) dan commit/rollback otomatis di akhir blok with
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+class ProcessSingleton:
+    # Instance tunggal per proses, dibuat saat pertama dipakai (double-checked locking).
+    # Exception di errors saat pembuatan membuat get() mengembalikan None; dicoba lagi
+    # pada panggilan berikutnya (mis. direktori data sementara read-only).
+    def __init__(self, factory, errors=()):
+        self._factory = factory
+        self._errors = errors
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self, *args):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    try:
+                        self._instance = self._factory(*args)
+                    except self._errors:
+                        return None
+                instance = self._instance
+        return instance
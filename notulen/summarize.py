@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from notulen.compact import compact_transcript
+from notulen.engine import generate_with_fallback, stream_with_fallback
+from notulen.merge import merge_notulen
+from notulen.prompts import (
+    CHARS_PER_TOKEN,
+    build_incremental_prompt,
+    build_notulen_prompt,
+    build_reduce_prompt,
+    build_segment_prompt,
+    estimate_tokens,
+)
+from notulen.vtt import SPEAKER_RE, cues_to_text
+
+# ==============================================================================
+# MAP-REDUCE SUMMARIZATION UNTUK RAPAT PANJANG
+# ==============================================================================
+# Transkrip pendek tetap satu prompt. Transkrip panjang (atau yang terkena
+# MAX_TOKENS) dipecah per batas cue/pembicara, tiap segmen dirangkum paralel
+# pada worker pool terbatas, lalu satu langkah reduce menyusun tabel notulen.
+# MAX_TOKENS adalah batas panjang OUTPUT: bila notulen hasil reduce tetap terlalu
+# panjang, notulen disusun bertahap (kelompok catatan pertama menjadi notulen
+# dasar, kelompok berikutnya hanya menghasilkan baris baru yang digabung lokal).
+
+SINGLE_PASS_MAX_TOKENS = 24000
+SEGMENT_TOKENS = 8000
+MIN_SEGMENT_TOKENS = 500
+MAP_WORKERS = 4
+
+
+def _speaker(line):
+    m = SPEAKER_RE.match(line)
+    return m.group(1) if m else None
+
+
+def _wrap_line(line, max_chars):
+    # Satu baris yang melebihi anggaran dipotong per kata
+    chunk, size = [], 0
+    for word in line.split():
+        if chunk and size + len(word) + 1 > max_chars:
+            yield " ".join(chunk)
+            chunk, size = [], 0
+        chunk.append(word)
+        size += len(word) + 1
+    if chunk:
+        yield " ".join(chunk)
+
+
+def split_segments(transcript, budget_tokens=SEGMENT_TOKENS):
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    soft_chars = int(budget_chars * 0.8)
+
+    segments, current, size, last_speaker = [], [], 0, None
+    for raw in transcript.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        speaker = _speaker(line)
+        for part in (_wrap_line(line, budget_chars) if len(line) > budget_chars else (line,)):
+            # Potong di pergantian pembicara setelah batas lunak, atau paksa di batas keras
+            if current and (size + len(part) > budget_chars or (size >= soft_chars and speaker != last_speaker)):
+                segments.append("\n".join(current))
+                current, size = [], 0
+            current.append(part)
+            size += len(part) + 1
+            last_speaker = speaker
+    if current:
+        segments.append("\n".join(current))
+    return segments
+
+
+def _summarize_segment(segment, index, total, api_key, generate, use_cache):
+    res = generate(build_segment_prompt(segment, index, total), api_key, fallback_on_max_tokens=False, use_cache=use_cache)
+    tokens = estimate_tokens(segment)
+    if res.get("max_tokens") and tokens > MIN_SEGMENT_TOKENS:
+        # Catatan segmen kepanjangan: belah dua lalu rangkum masing-masing
+        notes = []
+        for half in split_segments(segment, tokens // 2 + 1):
+            sub = _summarize_segment(half, index, total, api_key, generate, use_cache)
+            if not sub["success"]:
+                return sub
+            notes.append(sub["content"])
+        return {"success": True, "content": "\n\n".join(notes)}
+    return res
+
+
+def final_step(prompt_text, api_key, generate, use_cache, render_stream):
+    # Langkah yang menghasilkan tabel notulen; bila render_stream diberikan, token dialirkan ke UI
+    if render_stream is None:
+        return generate(prompt_text, api_key, fallback_on_max_tokens=False, use_cache=use_cache)
+    stream = stream_with_fallback(prompt_text, api_key, use_cache=use_cache)
+    render_stream(stream)
+    return stream.consume()
+
+
+def summarize_transcript(transcript, api_key, max_workers=MAP_WORKERS, generate=generate_with_fallback, use_cache=True, render_stream=None):
+    if estimate_tokens(transcript) <= SINGLE_PASS_MAX_TOKENS:
+        res = final_step(build_notulen_prompt(transcript), api_key, generate, use_cache, render_stream)
+        if not res.get("max_tokens"):
+            return res
+
+    segments = split_segments(transcript)
+    total = len(segments)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as pool:
+        results = list(pool.map(
+            lambda args: _summarize_segment(args[1], args[0], total, api_key, generate, use_cache),
+            enumerate(segments, 1),
+        ))
+
+    failed = next((r for r in results if not r["success"]), None)
+    if failed:
+        return {"success": False, "error": f"Gagal merangkum segmen transkrip. {failed['error']}"}
+
+    res = _reduce([r["content"] for r in results], api_key, generate, use_cache, render_stream)
+    res["segments"] = total
+    return res
+
+
+def _reduce(notes, api_key, generate, use_cache, render_stream=None):
+    res = final_step(build_reduce_prompt(notes), api_key, generate, use_cache, render_stream)
+    if not res.get("max_tokens"):
+        return res
+    if len(notes) < 2:
+        return {"success": False, "max_tokens": True,
+                "error": f"Notulen dari satu segmen tetap melebihi batas output model. {res['error']}"}
+    half = len(notes) // 2
+    base = _reduce(notes[:half], api_key, generate, use_cache)
+    if not base["success"]:
+        return base
+    res = _append_notes(base, notes[half:], api_key, generate, use_cache)
+    if res["success"]:
+        res["staged_reduce"] = True
+    return res
+
+
+def _append_notes(base, notes, api_key, generate, use_cache):
+    # Tambahkan baris notulen dari catatan segmen lanjutan; kelompok yang terlalu panjang dibelah dua
+    res = generate(build_incremental_prompt(base["content"], "\n\n".join(notes)), api_key,
+                   fallback_on_max_tokens=False, use_cache=use_cache)
+    if res.get("max_tokens") and len(notes) > 1:
+        half = len(notes) // 2
+        base = _append_notes(base, notes[:half], api_key, generate, use_cache)
+        return base if not base["success"] else _append_notes(base, notes[half:], api_key, generate, use_cache)
+    if res.get("max_tokens"):
+        return {"success": False, "max_tokens": True,
+                "error": f"Baris notulen dari satu segmen tetap melebihi batas output model. {res['error']}"}
+    if not res["success"]:
+        return res
+    return {**res, "content": merge_notulen(base["content"], res["content"])}
+
+
+def build_source_text(vtt_cues, manual_text="", compact=True):
+    # Teks transkrip berlabel sumber untuk prompt; mengembalikan (teks, statistik kompaksi atau None)
+    text, stats = "", None
+    if vtt_cues:
+        if compact:
+            vtt_text, stats = compact_transcript(vtt_cues)
+        else:
+            vtt_text = cues_to_text(vtt_cues)
+        text += "SUMBER 1 (TRANSKRIP OTOMATIS):\n" + vtt_text + "\n\n"
+    if manual_text:
+        text += "SUMBER 2 (CATATAN MANUAL):\n" + manual_text + "\n\n"
+    return text, stats
@@ -0,0 +1,199 @@
+import io
+import re
+
+from notulen.metrics import timed
+
+# ==============================================================================
+# PARSER VTT STREAMING
+# ==============================================================================
+# Membaca transkrip baris per baris (tanpa menyalin seluruh isi berkas) dan
+# menghasilkan cue ringkas: waktu mulai/selesai, pembicara, dan teks.
+
+TIMING_RE = re.compile(
+    r"^(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})\s+-->\s+(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})"
+)
+SPEAKER_RE = re.compile(r"^([^:]{1,64}):\s+(.+)$")
+
+# Batas pencocokan tumpang tindih kata antar cue berurutan (caption bergulir Zoom)
+MIN_OVERLAP_WORDS = 3
+MAX_OVERLAP_WORDS = 30
+
+# Blok non-cue WebVTT yang dilewati seluruhnya sampai baris kosong berikutnya
+SKIPPED_BLOCKS = ("NOTE", "STYLE", "REGION")
+
+
+class Cue:
+    __slots__ = ("start", "end", "speaker", "text")
+
+    def __init__(self, start, end, speaker, text):
+        self.start = start
+        self.end = end
+        self.speaker = speaker
+        self.text = text
+
+    def __repr__(self):
+        return f"Cue({self.start!r}, {self.end!r}, {self.speaker!r}, {self.text!r})"
+
+    def to_line(self):
+        return f"{self.speaker}: {self.text}" if self.speaker else self.text
+
+
+def format_timestamp(seconds):
+    if seconds is None:
+        return ""
+    total = int(seconds)
+    return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+
+
+def _seconds(h, m, s, ms):
+    return int(h or 0) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def _decode_lines(binary_lines):
+    # Tidak memakai TextIOWrapper agar berkas asal (mis. UploadedFile) tidak ikut tertutup
+    first = True
+    for raw in binary_lines:
+        if isinstance(raw, (bytes, bytearray)):
+            raw = raw.decode("utf-8", errors="replace")
+        if first:
+            raw, first = raw.lstrip("\ufeff"), False
+        yield raw
+
+
+def iter_lines(source):
+    # Terima str, bytes, objek berkas (teks/biner, termasuk UploadedFile Streamlit), atau iterable baris
+    if isinstance(source, str):
+        return io.StringIO(source)
+    if isinstance(source, (bytes, bytearray)):
+        return _decode_lines(io.BytesIO(source))
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return _decode_lines(source)
+
+
+def _make_cue(start, end, text_lines):
+    text = " ".join(text_lines)
+    speaker = None
+    m = SPEAKER_RE.match(text)
+    if m:
+        speaker, text = m.group(1).strip(), m.group(2).strip()
+    return Cue(start, end, speaker, text)
+
+
+def _is_block_keyword(line, keywords):
+    return any(line == k or line.startswith((k + " ", k + "\t")) for k in keywords)
+
+
+def _iter_raw_cues(lines):
+    timing = None
+    text_lines = []
+    held = None  # baris pertama blok: bisa jadi ID cue, bisa jadi teks biasa
+    # Aturan header/NOTE hanya berlaku untuk WebVTT asli (baris pertama "WEBVTT");
+    # pada teks biasa (.txt, catatan manual) baris "NOTE ..." adalah isi transkrip
+    first, vtt, skipping = True, False, False
+
+    for raw in lines:
+        line = raw.strip()
+        if first:
+            first = False
+            if _is_block_keyword(line, ("WEBVTT",)):
+                vtt = skipping = True  # blok header (mis. "Kind: captions") sampai baris kosong
+                continue
+        if skipping:
+            # Blok header/NOTE berakhir di baris kosong, atau di baris waktu bila cue
+            # pertama langsung menyusul header tanpa baris kosong
+            skipping = bool(line) and not ("-->" in line and TIMING_RE.match(line))
+            if skipping or not line:
+                continue
+        if not line:
+            if timing is not None and text_lines:
+                yield _make_cue(timing[0], timing[1], text_lines)
+            elif held is not None:
+                yield _make_cue(None, None, [held])
+            timing, text_lines, held = None, [], None
+            continue
+
+        m = TIMING_RE.match(line) if "-->" in line else None
+        if m:
+            if timing is not None and text_lines:
+                yield _make_cue(timing[0], timing[1], text_lines)
+            g = m.groups()
+            timing = (_seconds(*g[:4]), _seconds(*g[4:]))
+            text_lines, held = [], None
+            continue
+
+        if timing is not None:
+            text_lines.append(line)
+        elif held is None and vtt and _is_block_keyword(line, SKIPPED_BLOCKS):
+            skipping = True
+        elif held is None:
+            held = line
+        else:
+            # Blok tanpa baris waktu (mis. berkas .txt): setiap baris menjadi cue tanpa timestamp
+            yield _make_cue(None, None, [held])
+            held = line
+
+    if timing is not None and text_lines:
+        yield _make_cue(timing[0], timing[1], text_lines)
+    elif held is not None:
+        yield _make_cue(None, None, [held])
+
+
+def _contains(haystack, needle):
+    return f" {needle} " in f" {haystack} "
+
+
+def _merge_text(prev, new):
+    if new == prev:
+        return prev
+    prev_words, new_words = prev.split(), new.split()
+    if len(new_words) >= MIN_OVERLAP_WORDS and _contains(prev, new):
+        return prev
+    if len(prev_words) >= MIN_OVERLAP_WORDS and _contains(new, prev):
+        return new
+    limit = min(len(prev_words), len(new_words), MAX_OVERLAP_WORDS)
+    for k in range(limit, MIN_OVERLAP_WORDS - 1, -1):
+        if prev_words[-k:] == new_words[:k]:
+            return " ".join(prev_words + new_words[k:])
+    return None
+
+
+def collapse_cues(cues):
+    # Gabungkan cue berurutan dari pembicara sama yang teksnya berulang/tumpang tindih
+    prev = None
+    for cue in cues:
+        if prev is not None and prev.speaker == cue.speaker:
+            both_timed = prev.start is not None and cue.start is not None
+            merged = _merge_text(prev.text, cue.text) if both_timed else (prev.text if prev.text == cue.text else None)
+            if merged is not None:
+                prev.text = merged
+                if cue.end is not None and (prev.end is None or cue.end > prev.end):
+                    prev.end = cue.end
+                continue
+        if prev is not None:
+            yield prev
+        prev = cue
+    if prev is not None:
+        yield prev
+
+
+def parse_vtt(source, collapse=True):
+    cues = _iter_raw_cues(iter_lines(source))
+    return collapse_cues(cues) if collapse else cues
+
+
+def cues_to_text(cues):
+    return "\n".join(cue.to_line() for cue in cues if cue.text)
+
+
+def _source_size(source):
+    # Ukuran input tanpa membaca ulang berkas (UploadedFile Streamlit punya atribut .size)
+    if isinstance(source, (str, bytes, bytearray)):
+        return len(source)
+    return getattr(source, "size", None)
+
+
+@timed("process_vtt_text", chars_in=_source_size, chars_out=len)
+def process_vtt_text(vtt_source):
+    # Menerima teks maupun objek berkas; dibaca bertahap lewat parser cue streaming
+    return cues_to_text(parse_vtt(vtt_source))
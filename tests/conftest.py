@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Data (cache, arsip, job) dan metrik pengujian tidak boleh menyentuh .notulen_data milik app
+os.environ.setdefault("NOTULEN_DATA_DIR", tempfile.mkdtemp(prefix="notulen-test-"))
+os.environ.setdefault("NOTULEN_METRICS", "0")
+os.environ.pop("NOTULEN_BACKEND", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
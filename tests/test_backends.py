@@ -0,0 +1,76 @@
+import pytest
+
+from notulen.backends import (
+    Backend,
+    FakeReply,
+    FakeStreamingBackend,
+    MockGeminiBackend,
+    not_found_error,
+    quota_error,
+)
+from notulen.cache import ResponseCache
+from notulen.engine import FALLBACK_MODELS, GENERATION_CONFIG, generate_with_fallback, stream_with_fallback
+from notulen.registry import ModelRegistry
+
+M = FALLBACK_MODELS
+
+
+def generate(backend, registry=None, **kwargs):
+    registry = registry or ModelRegistry(FALLBACK_MODELS)
+    return generate_with_fallback("Budi: halo semua", "kunci", use_cache=False, backend=backend, registry=registry, **kwargs)
+
+
+def test_backend_requires_stream():
+    with pytest.raises(TypeError):
+        Backend()
+
+
+def test_fallback_skips_not_found_and_quota_models():
+    backend = FakeStreamingBackend({M[0]: not_found_error(M[0]), M[1]: quota_error(60)}, default="notulen")
+    registry = ModelRegistry(FALLBACK_MODELS)
+    res = generate(backend, registry)
+    assert res["success"] and res["content"] == "notulen" and res["model"] == M[2]
+    assert backend.calls == [M[0], M[1], M[2]]
+
+    # Model 404 dan model yang kena kuota diistirahatkan: panggilan berikutnya langsung ke M[2]
+    backend.calls.clear()
+    assert generate(backend, registry)["model"] == M[2]
+    assert backend.calls == [M[2]]
+
+
+def test_max_tokens_short_circuits_without_fallback():
+    backend = FakeStreamingBackend({M[0]: FakeReply("potongan", finish_reason="MAX_TOKENS")}, default="notulen")
+    res = generate(backend, fallback_on_max_tokens=False)
+    assert not res["success"] and res["max_tokens"]
+    assert backend.calls == [M[0]]
+
+
+def test_max_tokens_falls_back_when_allowed():
+    backend = FakeStreamingBackend({M[0]: FakeReply("potongan", finish_reason="MAX_TOKENS")}, default="notulen")
+    res = generate(backend)
+    assert res["success"] and res["model"] == M[1]
+
+
+def test_stream_fails_over_before_first_token():
+    backend = FakeStreamingBackend({M[0]: quota_error()}, default="jawaban lengkap dari model cadangan")
+    stream = stream_with_fallback("prompt", "kunci", use_cache=False, backend=backend, registry=ModelRegistry(FALLBACK_MODELS))
+    chunks = list(stream)
+    assert "".join(chunks) == "jawaban lengkap dari model cadangan"
+    assert stream.result["success"] and stream.result["model"] == M[1]
+    assert backend.calls == [M[0], M[1]]
+
+
+def test_stream_does_not_fail_over_after_first_token():
+    reply = FakeReply("jawaban yang terputus di tengah", error=Exception("500 internal"), fail_after=8)
+    backend = FakeStreamingBackend({M[0]: reply}, default="tidak boleh dipakai", chunk_size=4)
+    stream = stream_with_fallback("prompt", "kunci", use_cache=False, backend=backend, registry=ModelRegistry(FALLBACK_MODELS))
+    res = stream.consume()
+    assert not res["success"] and res["content"] == "jawaban "
+    assert backend.calls == [M[0]]
+
+
+def test_mock_answers_are_not_served_as_gemini_answers(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("prompt", M[0], GENERATION_CONFIG, "notulen mock", MockGeminiBackend.cache_namespace)
+    assert cache.lookup("prompt", M, GENERATION_CONFIG) is None
+    assert cache.lookup("prompt", M, GENERATION_CONFIG, MockGeminiBackend.cache_namespace)["content"] == "notulen mock"